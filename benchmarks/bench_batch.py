@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Batched transcription (--max-batch) against one clip at a time.
+
+Sends --clips fixtures at once through a BatchScheduler, as concurrent
+recordings or server clients do, and compares wall time, forward passes and
+the transcripts with transcribing the same clips one after another. Every
+decoding profile is run, since their options decide what can share a batch.
+
+--check runs the same comparison on a randomly initialized tiny Whisper (no
+model download, outputs capped at a few tokens, no sampled fallback) and exits non-zero if a
+batched transcript differs from its sequential one or a batch fails.
+
+Examples:
+  python benchmarks/bench_batch.py --check
+  python benchmarks/bench_batch.py --model base --clips 4 -o batch.json
+"""
+
+import argparse
+import sys
+import threading
+
+from common import RATE, holdscribe, load_fixtures, print_table, summarize, timed, write_results
+
+
+def random_tiny_model():
+    """A WhisperBackend holding tiny-sized random weights"""
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+    
+    torch.manual_seed(0)
+    dims = ModelDimensions(n_mels=80, n_audio_ctx=1500, n_audio_state=384, n_audio_head=6, n_audio_layer=4,
+                           n_vocab=51865, n_text_ctx=448, n_text_state=384, n_text_head=6, n_text_layer=4)
+    backend = holdscribe.WhisperBackend()
+    backend.model = Whisper(dims).eval()
+    backend.prompts = {}
+    return backend
+
+
+def transcribe_all(scheduler, clips, params, profile):
+    """Transcribe every clip from its own thread at once; returns texts, or raises the first error"""
+    texts, errors = [None] * len(clips), []
+    
+    def run(i):
+        try:
+            result = holdscribe.transcribe_with_profile(
+                lambda audio, **params: scheduler.transcribe(audio, **params), clips[i], params, profile, RATE)
+            texts[i] = result["text"]
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(clips))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare batched and sequential transcription")
+    parser.add_argument("--model", default="base", help="Whisper model size (default: base)")
+    parser.add_argument("--fixtures", help="Directory of 16 kHz mono WAV files (default: synthetic clips)")
+    parser.add_argument("--clips", type=int, default=4, help="Clips sent at once (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed rounds per profile (default: 3)")
+    parser.add_argument("--check", action="store_true",
+                        help="Only check batched against sequential output, on random weights")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    
+    fixtures = [audio for _, audio in load_fixtures(args.fixtures) if len(audio) <= 30 * RATE]
+    clips = [fixtures[i % len(fixtures)] for i in range(args.clips)]
+    if args.check:
+        model = random_tiny_model()
+        args.repeat = 1
+    else:
+        print(f"Loading '{args.model}'...")
+        model = holdscribe.load_model(args.model)
+    
+    rows, results, failed = [], [], False
+    for profile in holdscribe.PROFILES:
+        params = holdscribe.build_transcribe_params("en", holdscribe.ACCENT_PROMPTS["indian"], profile)
+        params["fp16"] = False
+        if args.check:
+            # Random weights rarely stop on their own, and would send every clip down the
+            # sampled (non-deterministic) fallback rungs
+            params.update(sample_len=8, logprob_threshold=float("-inf"),
+                          compression_ratio_threshold=float("inf"))
+        
+        sequential = holdscribe.BatchScheduler(model, max_batch=1)
+        batched = holdscribe.BatchScheduler(model, max_batch=len(clips), max_wait_ms=200)
+        try:
+            expected, _ = timed(lambda: [transcribe_all(sequential, [clip], params, profile)[0] for clip in clips])
+            rounds = [timed(transcribe_all, batched, clips, params, profile) for _ in range(args.repeat)]
+            error = None
+        except Exception as e:
+            rounds, error = [], e
+        finally:
+            batched.close()
+        
+        seq_times = [timed(lambda: [transcribe_all(sequential, [clip], params, profile) for clip in clips])[1]
+                     for _ in range(0 if args.check else args.repeat)]
+        matches = error is None and all(texts == expected for texts, _ in rounds)
+        failed |= not matches
+        record = {
+            "profile": profile,
+            "clips": len(clips),
+            "error": str(error) if error else None,
+            "matches_sequential": matches,
+            "forward_passes": batched.batches,
+            "batched": summarize([seconds for _, seconds in rounds]) if rounds else None,
+            "sequential": summarize(seq_times) if seq_times else None,
+        }
+        results.append(record)
+        rows.append({"profile": profile, "matches": "yes" if matches else f"NO ({error or 'text differs'})",
+                     "passes": batched.batches,
+                     "batched_p50_ms": record["batched"]["p50_ms"] if rounds else "-",
+                     "sequential_p50_ms": record["sequential"]["p50_ms"] if seq_times else "-"})
+    
+    print_table(rows, ["profile", "matches", "passes", "batched_p50_ms", "sequential_p50_ms"])
+    if args.output:
+        write_results(args.output, "batch", results)
+    if failed:
+        print("❌ Batched transcription failed or differs from sequential")
+        sys.exit(1)
+    print("✅ Batched transcription matches sequential for every profile")
+
+
+if __name__ == "__main__":
+    main()
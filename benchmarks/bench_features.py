@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Incremental log-mel features (LogMelStream) against Whisper's own spectrogram.
+
+Feeds every fixture through an AudioBuffer in 1024-sample chunks, as capture
+does, and checks that the features handed to the encoder on release match
+clip_mel() (whisper.log_mel_spectrogram, framed as transcribe() frames it)
+for the whole clip and for a trimmed range (the last 30 s of longer
+fixtures). Exits non-zero if any value is further off than --tolerance, or
+if capture computed frames past the 30 s Whisper reads. Also reports what is
+left to compute after release compared with computing the whole spectrogram
+then. --check times a single run and adds a 40 s recording.
+
+Examples:
+  python benchmarks/bench_features.py --check
+  python benchmarks/bench_features.py --fixtures clips/ --n-mels 128 -o features.json
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from common import RATE, holdscribe, load_fixtures, print_table, summarize, timed, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time incremental log-mel features")
+    parser.add_argument("--fixtures", help="Directory of 16 kHz mono WAV files (default: synthetic clips)")
+    parser.add_argument("--n-mels", type=int, default=80, choices=[80, 128],
+                        help="Mel bands: 80, or 128 for large-v3 (default: 80)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per fixture (default: 5)")
+    parser.add_argument("--tolerance", type=float, default=1e-3,
+                        help="Largest allowed difference in normalized log-mel (default: 0.001)")
+    parser.add_argument("--check", action="store_true", help="Only check the features, one timed run")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    fixtures = load_fixtures(args.fixtures)
+    if args.check:
+        args.repeat = 1
+        fixtures.append(("synthetic-40s", holdscribe.synthetic_speech(40, seed=len(fixtures))))
+    
+    from whisper.audio import mel_filters
+    filters = mel_filters("cpu", args.n_mels).numpy()
+    pcm_fixtures = [(name, (np.clip(audio, -1, 1) * 32767).astype(np.int16)) for name, audio in fixtures]
+    
+    rows, results, failed = [], [], False
+    for name, pcm in pcm_fixtures:
+        buffer = holdscribe.AudioBuffer(rate=RATE)
+        stream = holdscribe.LogMelStream(filters)
+        chunk_seconds = []
+        for i in range(0, len(pcm), 1024):
+            buffer.append(pcm[i:i + 1024].tobytes())
+            _, seconds = timed(stream.update, buffer)
+            chunk_seconds.append(seconds)
+        
+        # Whole clip, and a range trimmed the way find_speech trims (start on a frame).
+        # Past 30 s, the last 30 s and a range inside them, which need frames past the
+        # stream's first 30 s computed on release
+        if len(buffer) <= 30 * RATE:
+            ranges = ((0, len(buffer)), (min(25 * 160, len(buffer) // 4 // 160 * 160),
+                                         len(buffer) - len(buffer) // 8))
+        else:
+            start = -(-(len(buffer) - 30 * RATE) // 160) * 160
+            ranges = ((start, len(buffer)), (start + RATE, len(buffer) - RATE))
+        error = 0.0
+        for start, end in ranges:
+            audio = np.array(buffer.view(start, end))
+            expected = holdscribe.clip_mel(audio, args.n_mels).numpy()
+            error = max(error, float(np.abs(stream.features(buffer, start, end) - expected).max()))
+        computed = stream._next  # Frames computed during capture, at most 30 s worth
+        failed |= error > args.tolerance or computed > stream.N_FRAMES
+        
+        start, end = ranges[0]
+        audio = np.array(buffer.view(start, end))
+        full = [timed(holdscribe.clip_mel, audio, args.n_mels)[1] for _ in range(args.repeat)]
+        release = [timed(stream.features, buffer, start, end)[1] for _ in range(args.repeat)]
+        record = {
+            "fixture": name,
+            "max_abs_error": error,
+            "frames_during_capture": computed,
+            "per_chunk": summarize(chunk_seconds),
+            "after_release_full": summarize(full),
+            "after_release_incremental": summarize(release),
+        }
+        results.append(record)
+        rows.append({"fixture": name, "max_error": f"{error:.2e}",
+                     "chunk_p95_ms": record["per_chunk"]["p95_ms"],
+                     "full_p50_ms": record["after_release_full"]["p50_ms"],
+                     "incremental_p50_ms": record["after_release_incremental"]["p50_ms"]})
+    
+    print_table(rows, ["fixture", "max_error", "chunk_p95_ms", "full_p50_ms", "incremental_p50_ms"])
+    if args.output:
+        write_results(args.output, "features", results)
+    if failed:
+        print(f"❌ Features differ from whisper.log_mel_spectrogram by more than {args.tolerance}, "
+              f"or capture computed more than 30s of frames")
+        sys.exit(1)
+    print(f"✅ Features match whisper.log_mel_spectrogram within {args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
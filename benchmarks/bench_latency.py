@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+End-to-end and per-stage latency benchmark.
+
+Feeds fixed audio fixtures through the same stages a push-to-talk utterance
+goes through and reports p50/p95 per stage and per model:
+
+  capture     converting 1024-frame PyAudio chunks into the recording, including
+              the log-mel features computed while the key is held
+  assemble    taking the finished recording out of the buffer
+  vad         locating speech and trimming silence
+  wav_write   writing a temporary WAV file (the pre-1.4 path, for reference)
+  features    finishing the log-mel features of the trimmed clip
+  transcribe  decoding the trimmed clip as the app does: those features through
+              decode_mels when the model supports it (model.transcribe
+              otherwise), under the --profile fallback ladder
+  paste       delivering the text through the paste engine (a stub injector
+              unless --paste is given)
+  release     everything after key release: assemble + vad + features +
+              transcribe + paste
+
+Examples:
+  python benchmarks/bench_latency.py --stub
+  python benchmarks/bench_latency.py --models tiny base --repeat 5 -o latency.json
+  python benchmarks/bench_latency.py --models base --backend faster-whisper
+  python benchmarks/bench_latency.py --models base --profile fast --no-incremental-mel
+"""
+
+import argparse
+import os
+import tempfile
+import wave
+
+from common import (StubModel, holdscribe, load_fixtures, print_table, summarize,
+                    timed, to_pcm_chunks, write_results, RATE)
+
+
+def write_wav(audio):
+    """Write audio to a temporary WAV file the way releases up to 1.3.8 did"""
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+        path = temp_file.name
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes((audio * 32767).astype("<i2").tobytes())
+    os.unlink(path)
+
+
+def decode(model, audio, features, params):
+    """One decode, the way HoldScribe._decode runs it without a batch scheduler"""
+    if features is not None and holdscribe.decodes_directly(model, params):
+        return holdscribe.decode_mels(model, [features], [len(audio) / RATE], params)[0]
+    return model.transcribe(audio, **params)
+
+
+def run_utterance(model, chunks, params, paste, profile, incremental_mel=True):
+    """Push one recording through every stage and return {stage: seconds}"""
+    timings = {}
+    
+    recording = holdscribe.Recording(RATE)
+    if incremental_mel and holdscribe.decodes_directly(model, params):
+        recording.features = holdscribe.LogMelStream.for_model(model)
+    _, timings["capture"] = timed(lambda: [recording.append(chunk) for chunk in chunks])
+    
+    audio, timings["assemble"] = timed(recording.buffer.view)
+    speech, timings["vad"] = timed(holdscribe.find_speech, audio, RATE)
+    start, end = (speech[0], speech[1]) if speech is not None else (0, len(audio))
+    audio = audio[start:end]
+    _, timings["wav_write"] = timed(write_wav, audio)
+    
+    features, timings["features"] = None, 0.0
+    if recording.features is not None:
+        features, timings["features"] = timed(recording.features.features, recording.buffer, start, end)
+    
+    result, timings["transcribe"] = timed(
+        holdscribe.transcribe_with_profile,
+        lambda audio, **params: decode(model, audio, features, params), audio, params, profile, RATE)
+    _, timings["paste"] = timed(paste, result["text"].strip() or "test")
+    
+    timings["release"] = (timings["assemble"] + timings["vad"] + timings["features"]
+                          + timings["transcribe"] + timings["paste"])
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HoldScribe per-stage latency benchmark")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"],
+                        help="Whisper model sizes to benchmark (default: tiny base)")
+    parser.add_argument("--backend", default="whisper", choices=sorted(holdscribe.BACKENDS),
+                        help="Inference backend for the real models (default: whisper)")
+    parser.add_argument("--quantize", action="store_true", help="Benchmark int8 quantized models")
+    parser.add_argument("--profile", default=holdscribe.DEFAULT_PROFILE, choices=list(holdscribe.PROFILES),
+                        help="Decoding profile, as with holdscribe --profile (default: %(default)s)")
+    parser.add_argument("--no-incremental-mel", action="store_true",
+                        help="Let the model compute log-mel features itself, as with holdscribe --no-incremental-mel")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a stub model instead of Whisper (no model download needed)")
+    parser.add_argument("--stub-rtf", type=float, default=0.05,
+                        help="Real-time factor of the stub model (default: 0.05)")
+    parser.add_argument("--fixtures", help="Directory of 16 kHz mono WAV files (default: synthetic clips)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per fixture (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per model first (default: 1)")
+    parser.add_argument("--paste", action="store_true",
+                        help="Paste into the focused window with the real injector (needs a display)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    
+    fixtures = [(name, audio, to_pcm_chunks(audio)) for name, audio in load_fixtures(args.fixtures)]
+    params = holdscribe.build_transcribe_params("en", holdscribe.ACCENT_PROMPTS["indian"], args.profile)
+    injector = holdscribe.create_injector() if args.paste else holdscribe.StubInjector()
+    paste = holdscribe.PasteEngine(injector).paste
+    
+    models = {"stub": StubModel(args.stub_rtf)} if args.stub else {}
+    if not args.stub:
+        for size in args.models:
+            print(f"Loading '{size}'...")
+            models[size] = holdscribe.load_model(size, quantize=args.quantize, backend=args.backend)
+    
+    rows, results = [], []
+    for model_name, model in models.items():
+        for _ in range(args.warmup):
+            run_utterance(model, fixtures[0][2], params, paste, args.profile, not args.no_incremental_mel)
+        
+        for name, audio, chunks in fixtures:
+            runs = [run_utterance(model, chunks, params, paste, args.profile, not args.no_incremental_mel)
+                    for _ in range(args.repeat)]
+            for stage in runs[0]:
+                stats = summarize([run[stage] for run in runs])
+                results.append({"model": model_name, "backend": "stub" if args.stub else args.backend,
+                                "quantize": args.quantize, "profile": args.profile, "fixture": name,
+                                "audio_seconds": round(len(audio) / RATE, 3), "stage": stage, **stats})
+                rows.append({"model": model_name, "fixture": name, "stage": stage,
+                             "p50_ms": stats["p50_ms"], "p95_ms": stats["p95_ms"]})
+    
+    print()
+    print_table(rows, ["model", "fixture", "stage", "p50_ms", "p95_ms"])
+    if args.output:
+        write_results(args.output, "latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Latency and accuracy of the --profile decoding profiles.
+
+Transcribes every fixture under each profile the way push-to-talk does
+(holdscribe.transcribe_with_profile, including its fallback ladder and time
+budget) and reports p50/p95/max latency, word error rate against NAME.txt
+references (when the fixture directory has them), decode attempts per
+utterance and how often the budget cut the ladder short. --snr adds white
+noise to the fixtures, which is what sends clips down the fallback ladder.
+
+Examples:
+  python benchmarks/bench_profiles.py --fixtures clips/ --model base
+  python benchmarks/bench_profiles.py --fixtures clips/ --snr 5 -o profiles.json
+"""
+
+import argparse
+
+import numpy as np
+
+from common import (holdscribe, load_fixtures, load_references, print_table, summarize,
+                    timed, word_error_rate, write_results)
+
+
+def add_noise(audio, snr_db, seed=0):
+    """White noise mixed in at the given signal-to-noise ratio"""
+    power = float(np.mean(audio ** 2)) or 1e-8
+    noise = np.random.default_rng(seed).standard_normal(len(audio)) * np.sqrt(power / 10 ** (snr_db / 10))
+    return (audio + noise).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the --profile decoding profiles")
+    parser.add_argument("--model", default="base", help="Whisper model size (default: base)")
+    parser.add_argument("--backend", default="whisper", choices=sorted(holdscribe.BACKENDS),
+                        help="Inference backend (default: whisper)")
+    parser.add_argument("--quantize", action="store_true", help="Benchmark an int8 quantized model")
+    parser.add_argument("--profiles", nargs="+", default=list(holdscribe.PROFILES),
+                        choices=list(holdscribe.PROFILES), help="Profiles to compare (default: all)")
+    parser.add_argument("--fixtures", help="Directory of 16 kHz mono WAV files with optional NAME.txt references")
+    parser.add_argument("--snr", type=float, help="Add white noise at this signal-to-noise ratio in dB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per fixture (default: 3)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    
+    fixtures = load_fixtures(args.fixtures)
+    if args.snr is not None:
+        fixtures = [(name, add_noise(audio, args.snr, seed=i)) for i, (name, audio) in enumerate(fixtures)]
+    references = load_references(args.fixtures) if args.fixtures else {}
+    
+    print(f"Loading '{args.model}'...")
+    model = holdscribe.load_model(args.model, quantize=args.quantize, backend=args.backend)
+    
+    rows, results = [], []
+    for profile in args.profiles:
+        params = holdscribe.build_transcribe_params("en", holdscribe.ACCENT_PROMPTS["indian"], profile)
+        holdscribe.warm_up(model, params, runs=1)
+        
+        latencies, errors, attempts, degraded = [], [], [], 0
+        for name, audio in fixtures:
+            for _ in range(args.repeat):
+                result, seconds = timed(holdscribe.transcribe_with_profile,
+                                        model.transcribe, audio, params, profile)
+                latencies.append(seconds)
+                attempts.append(result["attempts"])
+                degraded += result["degraded"]
+            if name in references:
+                errors.append(word_error_rate(references[name], result["text"].strip()))
+        
+        record = {
+            "profile": profile,
+            "model": args.model,
+            "backend": args.backend,
+            "quantize": args.quantize,
+            "snr_db": args.snr,
+            "latency": dict(summarize(latencies), max_ms=round(max(latencies) * 1000, 3)),
+            "wer": round(sum(errors) / len(errors), 4) if errors else None,
+            "mean_attempts": round(sum(attempts) / len(attempts), 3),
+            "budget_exhausted": degraded,
+        }
+        results.append(record)
+        rows.append({"profile": profile,
+                     "p50_ms": record["latency"]["p50_ms"], "p95_ms": record["latency"]["p95_ms"],
+                     "max_ms": record["latency"]["max_ms"],
+                     "wer": record["wer"] if record["wer"] is not None else "-",
+                     "attempts": record["mean_attempts"], "cut_short": degraded})
+    
+    print()
+    print_table(rows, ["profile", "p50_ms", "p95_ms", "max_ms", "wer", "attempts", "cut_short"])
+    if args.output:
+        write_results(args.output, "profiles", results)
+
+
+if __name__ == "__main__":
+    main()
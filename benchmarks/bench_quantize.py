@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Accuracy and latency of int8 dynamic quantization against fp32.
+
+Transcribes every fixture with the fp32 and the --quantize model of each size
+and reports p50/p95 latency, word error rate against NAME.txt references (when
+the fixture directory has them) and how far int8 output drifts from fp32.
+
+Examples:
+  python benchmarks/bench_quantize.py --fixtures clips/ --models base small
+  python benchmarks/bench_quantize.py --models tiny -o quantize.json
+"""
+
+import argparse
+
+from common import (holdscribe, load_fixtures, load_references, print_table, summarize,
+                    timed, word_error_rate, write_results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare int8 quantized models with fp32")
+    parser.add_argument("--models", nargs="+", default=["base", "small"],
+                        help="Whisper model sizes to compare (default: base small)")
+    parser.add_argument("--fixtures", help="Directory of 16 kHz mono WAV files with optional NAME.txt references")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per fixture (default: 3)")
+    parser.add_argument("--threads", type=int, help="Torch threads for inference")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    
+    fixtures = load_fixtures(args.fixtures)
+    references = load_references(args.fixtures) if args.fixtures else {}
+    params = holdscribe.build_transcribe_params("en")
+    holdscribe.configure_inference(threads=args.threads)
+    
+    rows, results = [], []
+    for size in args.models:
+        texts = {}
+        for variant, quantize in (("fp32", False), ("int8", True)):
+            print(f"Loading '{size}' ({variant})...")
+            model, load_seconds = timed(holdscribe.load_model, size, quantize=quantize)
+            holdscribe.warm_up(model, params, runs=1)
+            
+            latencies, errors = [], []
+            for name, audio in fixtures:
+                for _ in range(args.repeat):
+                    result, seconds = timed(model.transcribe, audio, **params)
+                    latencies.append(seconds)
+                texts[variant, name] = result["text"].strip()
+                if name in references:
+                    errors.append(word_error_rate(references[name], texts[variant, name]))
+            
+            drift = [word_error_rate(texts["fp32", name], texts["int8", name])
+                     for name, _ in fixtures] if variant == "int8" else [0.0]
+            record = {
+                "model": size,
+                "variant": variant,
+                "load_seconds": round(load_seconds, 3),
+                "latency": summarize(latencies),
+                "wer": round(sum(errors) / len(errors), 4) if errors else None,
+                "drift_from_fp32": round(sum(drift) / len(drift), 4),
+            }
+            results.append(record)
+            rows.append({"model": size, "variant": variant,
+                         "p50_ms": record["latency"]["p50_ms"], "p95_ms": record["latency"]["p95_ms"],
+                         "wer": record["wer"] if record["wer"] is not None else "-",
+                         "drift": record["drift_from_fp32"], "load_s": record["load_seconds"]})
+            del model
+    
+    print()
+    print_table(rows, ["model", "variant", "p50_ms", "p95_ms", "wer", "drift", "load_s"])
+    if args.output:
+        write_results(args.output, "quantize", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cost and quality of converting native-rate capture to 16 kHz mono.
+
+Feeds synthetic speech through holdscribe.Resampler in the chunk sizes a
+microphone delivers (64 ms, as 1024 frames at 16 kHz) for common device rates
+and channel counts, and reports per-chunk p50/p95 time and the CPU time spent
+per second of audio (the real-time factor; far below 1 means capture keeps
+up easily). Quality columns compare against an ideal signal:
+
+  tone_err   largest error on a 440 Hz tone, relative to its amplitude
+  alias_db   level of a tone above 8 kHz that should be filtered out
+             (np.interp, the linear interpolation used before, for reference)
+
+Examples:
+  python benchmarks/bench_resample.py
+  python benchmarks/bench_resample.py --rates 48000 44100 --seconds 60 -o resample.json
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import holdscribe, print_table, summarize, write_results, RATE
+
+
+def tone(frequency, seconds, rate, amplitude=0.5):
+    """A float32 sine wave"""
+    return (amplitude * np.sin(2 * np.pi * frequency * np.arange(int(seconds * rate)) / rate)).astype(np.float32)
+
+
+def resample_all(audio, rate, channels=1):
+    """Resample a whole (interleaved) signal, flushing the filter at the end"""
+    resampler = holdscribe.Resampler(rate, RATE, channels)
+    return np.concatenate([resampler.process(audio), resampler.flush()])
+
+
+def level_db(audio, reference):
+    """RMS level of audio relative to a reference amplitude's sine RMS, in dB"""
+    return 20 * np.log10(max(float(np.sqrt(np.mean(audio ** 2))), 1e-12) / (reference / np.sqrt(2)))
+
+
+def quality(rate):
+    """(tone_err, alias_db, interp_alias_db) for one input rate, ignoring the filter's edges"""
+    edge = slice(RATE // 10, -RATE // 10)
+    out = resample_all(tone(440, 1.0, rate), rate)
+    error = np.abs(out - tone(440, 1.0, RATE)[:len(out)])[edge].max() / 0.5
+    
+    high_frequency = 0.45 * rate  # Close to the input Nyquist rate, aliases to a low frequency
+    if high_frequency <= RATE / 2:
+        return round(float(error), 6), "-", "-"  # No band above 8 kHz to alias from
+    high = tone(high_frequency, 1.0, rate)
+    positions = np.arange(RATE) * (rate / RATE)
+    interp = np.interp(positions, np.arange(len(high)), high)
+    return (round(float(error), 6), round(level_db(resample_all(high, rate)[edge], 0.5), 1),
+            round(level_db(interp[edge], 0.5), 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HoldScribe capture resampling benchmark")
+    parser.add_argument("--rates", nargs="+", type=int, default=[48000, 44100, 32000, 22050, 8000],
+                        help="Device sample rates to convert from (default: 48000 44100 32000 22050 8000)")
+    parser.add_argument("--channels", nargs="+", type=int, default=[1, 2],
+                        help="Channel counts to downmix from (default: 1 2)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Audio per configuration (default: 30)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    args = parser.parse_args()
+    
+    rows, results = [], []
+    for rate in args.rates:
+        speech = holdscribe.synthetic_speech(args.seconds, 0, rate)
+        tone_err, alias_db, interp_alias_db = quality(rate)
+        for channels in args.channels:
+            pcm = (np.repeat(speech[:, None], channels, axis=1) * 32767).astype(np.int16).ravel()
+            frames = 1024 * rate // RATE * channels
+            chunks = [pcm[i:i + frames] for i in range(0, len(pcm), frames)]
+            
+            resampler = holdscribe.Resampler(rate, RATE, channels)
+            timings = []
+            cpu_started = time.process_time()
+            for chunk in chunks:
+                started = time.perf_counter()
+                resampler.process(chunk)
+                timings.append(time.perf_counter() - started)
+            cpu = time.process_time() - cpu_started
+            
+            stats = summarize(timings)
+            record = {"rate": rate, "channels": channels, "seconds": args.seconds,
+                      "chunk": stats,
+                      "real_time_factor": round(cpu / args.seconds, 5),
+                      "tone_error": tone_err, "alias_db": alias_db, "interp_alias_db": interp_alias_db}
+            results.append(record)
+            rows.append({"rate": rate, "channels": channels, "chunk_p50_ms": stats["p50_ms"],
+                         "chunk_p95_ms": stats["p95_ms"], "rtf": record["real_time_factor"],
+                         "tone_err": tone_err, "alias_db": alias_db, "interp_alias_db": interp_alias_db})
+    
+    print_table(rows, ["rate", "channels", "chunk_p50_ms", "chunk_p95_ms", "rtf",
+                       "tone_err", "alias_db", "interp_alias_db"])
+    if args.output:
+        write_results(args.output, "resample", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Shared helpers for the HoldScribe benchmarks: fixtures, stub model, timing
+statistics and result files.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import wave
+
+import numpy as np
+
+# Benchmarks run from a source checkout, so import holdscribe from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import holdscribe  # noqa: E402
+from holdscribe import synthetic_speech  # noqa: E402
+
+RATE = 16000
+SYNTHETIC_DURATIONS = (1.0, 3.0, 10.0)
+
+
+def load_wav(path):
+    """Read a 16 kHz mono 16-bit WAV file as float32"""
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: fixtures must be 16 kHz mono 16-bit WAV")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768
+
+
+def load_fixtures(directory=None):
+    """Return [(name, audio)] from a directory of WAV files, or synthetic clips"""
+    if directory is None:
+        return [(f"synthetic-{seconds:g}s", synthetic_speech(seconds, seed=i))
+                for i, seconds in enumerate(SYNTHETIC_DURATIONS)]
+    
+    names = sorted(name for name in os.listdir(directory) if name.lower().endswith(".wav"))
+    return [(os.path.splitext(name)[0], load_wav(os.path.join(directory, name))) for name in names]
+
+
+def load_references(directory):
+    """Reference transcripts stored next to fixtures as NAME.txt"""
+    references = {}
+    for name in os.listdir(directory):
+        if name.endswith(".txt"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                references[os.path.splitext(name)[0]] = f.read().strip()
+    return references
+
+
+def to_pcm_chunks(audio, chunk=1024):
+    """Split float32 audio into the int16 byte chunks PyAudio would deliver"""
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    return [pcm[i:i + chunk].tobytes() for i in range(0, len(pcm), chunk)]
+
+
+class StubModel:
+    """Stands in for a Whisper model: sleeps for a fixed real-time factor"""
+    
+    def __init__(self, rtf=0.05, overhead=0.02):
+        self.rtf = rtf
+        self.overhead = overhead
+    
+    def transcribe(self, audio, **params):
+        duration = len(audio) / RATE
+        time.sleep(self.overhead + self.rtf * duration)
+        return {"text": " stub transcription", "segments": [], "language": params.get("language")}
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, seconds)"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def summarize(samples):
+    """p50/p95/mean of a list of durations in seconds, reported in milliseconds"""
+    values = np.asarray(samples) * 1000
+    return {
+        "n": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def environment():
+    """Metadata stored with every result file so runs can be compared"""
+    return {
+        "holdscribe": holdscribe.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_table(rows, columns):
+    """Print rows of dicts as an aligned text table"""
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def write_results(path, benchmark, results):
+    """Write machine-readable results with environment metadata"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": benchmark, "environment": environment(), "results": results}, f, indent=2)
+    print(f"\nResults written to {path}")
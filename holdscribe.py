@@ -6,17 +6,16 @@ Hold a key to record, release to transcribe and paste at cursor
 
 __version__ = "1.3.8"
 
-import pyaudio
-import wave
+import numpy as np
 import threading
 import queue
 import time
-import tempfile
 import os
 import sys
-from pynput import keyboard
-from pynput.keyboard import Key
-import whisper
+import json
+import socket
+import socketserver
+import tempfile
 import pyperclip
 import subprocess
 import platform
@@ -42,6 +41,14 @@ if platform.system() == "Darwin":
         # Fallback if objc not available
         AXIsProcessTrustedWithOptions = None
 
+# Accent-specific initial prompts
+ACCENT_PROMPTS = {
+    "indian": "The following is a transcription of Indian English speech. Common Indian English patterns and pronunciation should be expected.",
+    "american": "The following is a transcription of American English speech with standard American pronunciation.",
+    "british": "The following is a transcription of British English speech with standard British pronunciation.",
+    "australian": "The following is a transcription of Australian English speech with standard Australian pronunciation."
+}
+
 def check_accessibility_permissions(interactive=True):
     """Check and request accessibility permissions on macOS"""
     if platform.system() != "Darwin":
@@ -96,9 +103,1866 @@ def check_accessibility_permissions(interactive=True):
             return response == 'y' or response == 'yes'
         return False
 
+# Decoding profiles selectable with --profile. "options" go to model.transcribe;
+# transcribe_with_profile walks the temperature ladder while budget_seconds lasts
+# (None: no limit) and caps each clip at tokens_per_second of output (None: model default)
+PROFILES = {
+    # Greedy, no timestamp tokens, no retries and a length cap: the lowest worst-case latency
+    "fast": {
+        "options": {"without_timestamps": True, "condition_on_previous_text": False},
+        "temperatures": (0.0,),
+        "budget_seconds": None,
+        "tokens_per_second": 8,
+    },
+    # The decoding HoldScribe has always used: one greedy decode at temperature 0
+    "balanced": {
+        "options": {},
+        "temperatures": (0.0,),
+        "budget_seconds": None,
+        "tokens_per_second": None,
+    },
+    # Beam search and openai-whisper's full fallback ladder
+    "accurate": {
+        "options": {"beam_size": 5},
+        "temperatures": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "best_of": 5,
+        "budget_seconds": 15.0,
+        "tokens_per_second": None,
+    },
+}
+DEFAULT_PROFILE = "balanced"
+
+# Languages whose words take about one or two tokens each, so that a
+# tokens_per_second cap fits normal speech; other scripts (Hindi, Japanese,
+# Russian...) need several times more tokens per word and are never capped
+COMPACT_TOKEN_LANGUAGES = {"en", "es", "fr", "de", "it", "pt", "nl", "ca", "sv", "da", "no", "id", "ms"}
+
+
+def build_transcribe_params(language, initial_prompt=None, profile=None):
+    """Build the keyword arguments passed to model.transcribe
+    
+    With a profile, its decoding options are included and the temperature is the
+    first rung of its ladder; the rest is up to transcribe_with_profile.
+    """
+    # Optimized transcription parameters for speed and Indian accent
+    transcribe_params = {
+        "language": language,
+        "task": "transcribe",
+        "temperature": 0.0,  # More deterministic output
+    }
+    if profile:
+        transcribe_params.update(PROFILES[profile]["options"])
+        transcribe_params["temperature"] = PROFILES[profile]["temperatures"][0]
+    
+    # Add initial prompt if specified (helps with accent/context)
+    if initial_prompt:
+        transcribe_params["initial_prompt"] = initial_prompt
+    return transcribe_params
+
+
+def load_model(model_size, quantize=False, backend="whisper", mmap=False):
+    """Load a model with the named inference backend (see BACKENDS)"""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[backend]().load(model_size, quantize=quantize, mmap=mmap)
+
+
+def load_whisper_model(model_size, quantize=False):
+    """Load an openai-whisper model (imports whisper and torch on first use)
+    
+    With quantize, the int8 model is read from the on-disk cache, or converted
+    from the fp32 model and cached on first use.
+    """
+    import whisper
+    if not quantize:
+        return whisper.load_model(model_size)
+    
+    import torch
+    path = quantized_cache_path(model_size)
+    if os.path.exists(path):
+        try:
+            return torch.load(path, map_location="cpu", weights_only=False)
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable quantized cache {path}: {e}")
+    
+    print(f"Quantizing '{model_size}' to int8 (first use only)...")
+    model = quantize_model(whisper.load_model(model_size, device="cpu"))
+    temp_path = f"{path}.{os.getpid()}.tmp"  # Batch workers may convert concurrently
+    torch.save(model, temp_path)
+    os.replace(temp_path, path)
+    return model
+
+
+def load_whisper_mmap(model_size):
+    """Load an fp32 Whisper model with its weights memory-mapped from a local cache
+    
+    The first call converts the downloaded checkpoint (fp16 on disk) once. Later
+    loads map the cache file instead of reading and copying it and skip random
+    weight initialization, so a reload takes a fraction of a second and the
+    weight pages are file-backed, easy for the OS to drop again.
+    """
+    import torch
+    import whisper
+    from whisper.model import AudioEncoder, ModelDimensions, TextDecoder, Whisper
+    
+    path = mmap_cache_path(model_size)
+    if not os.path.exists(path):
+        model = whisper.load_model(model_size, device="cpu")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        torch.save({"dims": vars(model.dims), "model_state_dict": model.state_dict()}, temp_path)
+        os.replace(temp_path, path)
+        return model
+    
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    dims = ModelDimensions(**checkpoint["dims"])
+    
+    # Whisper.__init__ without allocating or initializing weights; its sparse
+    # alignment_heads buffer has no meta implementation, so it is set below
+    model = Whisper.__new__(Whisper)
+    torch.nn.Module.__init__(model)
+    model.dims = dims
+    with torch.device("meta"):
+        model.encoder = AudioEncoder(dims.n_mels, dims.n_audio_ctx, dims.n_audio_state,
+                                     dims.n_audio_head, dims.n_audio_layer)
+        model.decoder = TextDecoder(dims.n_vocab, dims.n_text_ctx, dims.n_text_state,
+                                    dims.n_text_head, dims.n_text_layer)
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    
+    # Buffers that are not part of the state dict
+    mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-np.inf).triu_(1)
+    model.decoder.register_buffer("mask", mask, persistent=False)
+    all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    all_heads[dims.n_text_layer // 2:] = True
+    model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+    if model_size in whisper._ALIGNMENT_HEADS:
+        model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_size])
+    
+    if any(tensor.is_meta for tensor in list(model.parameters()) + list(model.buffers())):
+        raise RuntimeError(f"{path} does not match this whisper version")
+    return model.eval()
+
+
+def mmap_cache_path(model_size):
+    """Cache file of fp32 weights for memory-mapped loading, keyed on the whisper version"""
+    import whisper
+    directory = os.path.join(cache_dir(), "mmap")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{model_size}-fp32-whisper{whisper.__version__}.pt")
+
+
+def release_memory():
+    """Hand memory freed by dropping a model back to the OS"""
+    import ctypes
+    import gc
+    
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    
+    # The allocator keeps freed heap pages for reuse unless asked to trim them
+    try:
+        if sys.platform.startswith("linux"):
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        elif sys.platform == "darwin":
+            ctypes.CDLL("libc.dylib").malloc_zone_pressure_relief(None, 0)
+    except (OSError, AttributeError):
+        pass
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to every linear layer of a CPU Whisper model"""
+    import warnings
+    import torch
+    import whisper.model
+    
+    # Whisper subclasses nn.Linear only to cast weights for fp16, which int8 CPU
+    # inference never uses; torch only quantizes exact nn.Linear modules
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantized_cache_path(model_size):
+    """Cache file for a quantized model, keyed on the whisper and torch versions"""
+    import torch
+    import whisper
+    directory = os.path.join(cache_dir(), "quantized")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{model_size}-int8-whisper{whisper.__version__}-torch{torch.__version__}.pt")
+
+
+class InferenceBackend:
+    """A speech-to-text engine: load() a model size, then transcribe() 16 kHz float32 arrays
+    
+    transcribe() takes openai-whisper style keyword arguments (language, task,
+    temperature, initial_prompt, ...) and returns a dict with "text", "segments"
+    and "language", so backends are interchangeable everywhere a model is used.
+    """
+    
+    name = None
+    # Optional features: "quantize" (int8 inference), "temperature_fallback",
+    # "word_timestamps", "torch_model" (exposes the openai-whisper module as .model)
+    capabilities = frozenset()
+    
+    def load(self, model_size, quantize=False, mmap=False):
+        """Load the model and return self
+        
+        mmap asks for the fastest possible (re)load from a local cache, for
+        processes that unload the model while idle; backends may ignore it.
+        """
+        raise NotImplementedError
+    
+    def transcribe(self, audio, **params):
+        raise NotImplementedError
+    
+    def load_audio(self, path):
+        """Decode an audio file to a 16 kHz float32 array"""
+        raise NotImplementedError
+
+
+class WhisperBackend(InferenceBackend):
+    """The reference openai-whisper implementation on torch"""
+    
+    name = "whisper"
+    capabilities = frozenset({"quantize", "temperature_fallback", "word_timestamps", "torch_model"})
+    
+    def load(self, model_size, quantize=False, mmap=False):
+        self.prompts = {}  # (prompt, language, task) -> token ids
+        if mmap and not quantize:
+            try:
+                self.model = load_whisper_mmap(model_size)
+                return self
+            except Exception as e:
+                print(f"⚠️  Memory-mapped load failed ({e}), loading normally")
+        self.model = load_whisper_model(model_size, quantize=quantize)
+        return self
+    
+    def transcribe(self, audio, **params):
+        return self.model.transcribe(audio, **params)
+    
+    def prompt_tokens(self, prompt, language=None, task="transcribe"):
+        """Token ids of an initial prompt, encoded once per prompt and language
+        
+        whisper.decode takes them in place of the string; model.transcribe only
+        accepts text, so this serves the direct decode path (decode_mels).
+        """
+        key = (prompt, language, task)
+        if key not in self.prompts:
+            import whisper
+            tokenizer = whisper.tokenizer.get_tokenizer(
+                self.model.is_multilingual, num_languages=self.model.num_languages,
+                language=language, task=task)
+            self.prompts[key] = tokenizer.encode(" " + prompt.strip())
+        return self.prompts[key]
+    
+    def load_audio(self, path):
+        import whisper
+        return whisper.load_audio(path)
+
+
+class FasterWhisperBackend(InferenceBackend):
+    """CTranslate2-based faster-whisper, usually several times faster on CPU
+    
+    Optional dependency: pip install faster-whisper
+    """
+    
+    name = "faster-whisper"
+    capabilities = frozenset({"quantize", "temperature_fallback", "word_timestamps"})
+    
+    # openai-whisper option names that faster-whisper spells differently
+    RENAMED_PARAMS = {"logprob_threshold": "log_prob_threshold", "sample_len": "max_new_tokens"}
+    # Options faster-whisper has no equivalent for
+    IGNORED_PARAMS = {"fp16", "verbose"}
+    
+    def load(self, model_size, quantize=False, mmap=False):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("the faster-whisper backend needs: pip install faster-whisper")
+        
+        # CTranslate2 picks its CPU thread count from OMP_NUM_THREADS (see configure_inference)
+        name = "large-v3" if model_size == "large" else model_size
+        self.model = WhisperModel(name, device="cpu", compute_type="int8" if quantize else "default")
+        self.prompts = {}  # Prompt text -> token ids
+        return self
+    
+    def transcribe(self, audio, **params):
+        options = {self.RENAMED_PARAMS.get(key, key): value for key, value in params.items()
+                   if key not in self.IGNORED_PARAMS}
+        options.setdefault("beam_size", 1)  # openai-whisper decodes greedily unless asked otherwise
+        if isinstance(options.get("initial_prompt"), str):
+            options["initial_prompt"] = self.prompt_tokens(options["initial_prompt"])
+        segments, info = self.model.transcribe(audio, **options)
+        segments = [{
+            "id": segment.id,
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text,
+            "avg_logprob": segment.avg_logprob,
+            "compression_ratio": segment.compression_ratio,
+            "no_speech_prob": segment.no_speech_prob,
+        } for segment in segments]  # Decoding happens lazily while iterating
+        return {"text": "".join(segment["text"] for segment in segments),
+                "segments": segments, "language": info.language}
+    
+    def prompt_tokens(self, prompt):
+        """Token ids of an initial prompt, encoded once per session
+        
+        faster-whisper accepts token ids wherever it accepts the prompt text.
+        """
+        if prompt not in self.prompts:
+            encoding = self.model.hf_tokenizer.encode(" " + prompt.strip(), add_special_tokens=False)
+            self.prompts[prompt] = encoding.ids
+        return self.prompts[prompt]
+    
+    def load_audio(self, path):
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=16000)
+
+
+# Backends selectable with --backend
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def parse_cpu_list(text):
+    """Parse a CPU list like "0-3,6" into a set of CPU numbers"""
+    cpus = set()
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        elif part.strip():
+            cpus.add(int(part))
+    return cpus
+
+
+def configure_inference(threads=None, interop_threads=None, cpu_affinity=None):
+    """Apply thread counts and CPU affinity before the first inference"""
+    try:
+        import torch
+    except ImportError:
+        torch = None  # The faster-whisper backend runs without torch
+    
+    if threads:
+        os.environ["OMP_NUM_THREADS"] = str(threads)  # Read by CTranslate2 at load
+        if torch:
+            torch.set_num_threads(threads)
+    if interop_threads and torch:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            # Only allowed before torch has started any inter-op work
+            print(f"⚠️  Could not set inter-op threads: {e}")
+    if cpu_affinity:
+        set_cpu_affinity(cpu_affinity)
+
+
+def set_cpu_affinity(cpus):
+    """Pin the calling thread, and every thread it starts afterwards, to the given CPUs
+    
+    On Linux the mask is per thread and inherited at creation, so this has to
+    run on the main thread before any worker or inference threads exist.
+    """
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    else:
+        print("⚠️  CPU affinity is not supported on this platform, ignoring --cpu-affinity")
+
+
+def warm_up(model, params, runs=3, rate=16000, direct=False, batch=1):
+    """Run a few transcriptions of synthetic audio so the first real one is not the slowest
+    
+    The first call pays for tokenizer and mel filter loading, allocator growth
+    and kernel selection. With direct, models decode_mels can run go through it
+    instead of model.transcribe, as incremental features and BatchScheduler do,
+    batch clips at a time. Returns (first_call_seconds, steady_state_seconds).
+    """
+    models = model.models.values() if isinstance(model, ModelPool) else [model]
+    audio = (np.random.default_rng(0).standard_normal(rate) * 0.001).astype(np.float32)
+    direct = direct and decodes_directly(model, params)
+    if params.get("beam_size") or params.get("best_of"):
+        batch = 1  # BatchScheduler runs these one clip at a time
+    
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for each in models:
+            if direct:
+                mel = clip_mel(audio, each.model.dims.n_mels)
+                decode_mels(each, [mel] * batch, [len(audio) / rate] * batch, params)
+            else:
+                each.transcribe(audio, **params)
+        timings.append(time.perf_counter() - started)
+    steady = sorted(timings[1:])[len(timings[1:]) // 2] if runs > 1 else timings[0]
+    return timings[0], steady
+
+
+# Model sizes from fastest to most accurate
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large")
+
+# Approximate resident memory of each model's fp32 weights, in MB
+MODEL_MEMORY_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3060, "large": 6170}
+
+
+def mean_logprob(result):
+    """Average token log probability over a transcription's segments"""
+    logprobs = [segment["avg_logprob"] for segment in result.get("segments", [])
+                if segment.get("avg_logprob") is not None]
+    return sum(logprobs) / len(logprobs) if logprobs else 0.0
+
+
+def needs_fallback(result, compression_ratio_threshold=2.4, logprob_threshold=-1.0,
+                   no_speech_threshold=0.6):
+    """Whether a result fails openai-whisper's checks for a retry at a higher temperature
+    
+    Repetitive text (high gzip compression ratio) or a low mean log probability
+    fail, unless the segments look like silence rather than a bad decode.
+    """
+    segments = result.get("segments") or []
+    if not segments:
+        return False
+    if all((segment.get("no_speech_prob") or 0.0) > no_speech_threshold for segment in segments):
+        return False
+    if max(segment.get("compression_ratio") or 0.0 for segment in segments) > compression_ratio_threshold:
+        return True
+    return mean_logprob(result) < logprob_threshold
+
+
+def transcribe_with_profile(transcribe, audio, params, profile=DEFAULT_PROFILE, rate=16000):
+    """Run transcribe(audio, **params) through a profile's temperature ladder
+    
+    Each rung is one decode at a single temperature, so a noisy clip cannot
+    trigger an unbounded series of re-decodes: the next rung is only tried if
+    another attempt as long as the last one still fits in the profile's time
+    budget. Otherwise the best result so far (highest mean log probability) is
+    returned. The result gets "attempts" and "degraded" (ladder cut short) keys.
+    """
+    settings = PROFILES[profile]
+    params = dict(params)
+    if (settings["tokens_per_second"] and not isinstance(audio, str)
+            and params.get("language") in COMPACT_TOKEN_LANGUAGES):
+        # Bounds the worst case of a hallucination loop; 224 is whisper's own limit. Rounded
+        # up to a few fixed sizes so clips of similar length can share a batch (BatchScheduler)
+        needed = int(settings["tokens_per_second"] * len(audio) / rate) + 16
+        params["sample_len"] = next(size for size in (32, 64, 128, 224) if size >= min(needed, 224))
+    thresholds = {name: params[name] for name in
+                  ("compression_ratio_threshold", "logprob_threshold", "no_speech_threshold")
+                  if params.get(name) is not None}
+    
+    started = time.perf_counter()
+    best = None
+    attempts = 0
+    degraded = False
+    ladder = settings["temperatures"]
+    for i, temperature in enumerate(ladder):
+        if temperature > 0:
+            # Sampling replaces beam search, as in openai-whisper's fallback
+            params.pop("beam_size", None)
+            params.pop("patience", None)
+            if settings.get("best_of"):
+                params["best_of"] = settings["best_of"]
+        attempt_started = time.perf_counter()
+        result = transcribe(audio, **dict(params, temperature=temperature))
+        attempts += 1
+        
+        failed = needs_fallback(result, **thresholds)
+        if best is None or not failed or mean_logprob(result) > mean_logprob(best):
+            best = result
+        if not failed or i == len(ladder) - 1:
+            break
+        now = time.perf_counter()
+        budget = settings["budget_seconds"]
+        if budget is not None and (now - started) + (now - attempt_started) > budget:
+            degraded = True
+            break
+    
+    best["attempts"] = attempts
+    best["degraded"] = degraded
+    return best
+
+
+class ModelPool:
+    """Several resident model sizes, with each transcription routed by clip length
+    
+    Clips up to short_seconds go to the smallest resident model and longer ones
+    to the default size. If escalate_logprob is set, results whose mean token
+    log probability falls below it are redone on the next larger resident model.
+    Models are loaded by load(), in priority order, while they fit memory_budget_mb.
+    """
+    
+    def __init__(self, default_size, sizes, memory_budget_mb=None, short_seconds=3.0,
+                 escalate_logprob=None, rate=16000, quantize=False, backend="whisper"):
+        self.default_size = default_size
+        self.sizes = sorted(set(sizes) | {default_size}, key=MODEL_SIZES.index)
+        self.memory_budget_mb = memory_budget_mb
+        self.short_seconds = short_seconds
+        self.escalate_logprob = escalate_logprob
+        self.rate = rate
+        self.quantize = quantize
+        self.backend = backend
+        self.models = {}
+    
+    def load(self, loader=None, mmap=False):
+        """Load the default size, then the others from smallest up, within the budget"""
+        if loader is None:
+            loader = lambda size: load_model(size, quantize=self.quantize, backend=self.backend, mmap=mmap)
+        self.models = {}
+        priority = [self.default_size] + [size for size in self.sizes if size != self.default_size]
+        used_mb = 0
+        for size in priority:
+            # int8 linear layers take a quarter of the space, embeddings stay fp32
+            needed_mb = MODEL_MEMORY_MB[size] // (2 if self.quantize else 1)
+            if self.memory_budget_mb and self.models and used_mb + needed_mb > self.memory_budget_mb:
+                print(f"⚠️  Skipping model '{size}': {needed_mb}MB would exceed the "
+                      f"{self.memory_budget_mb}MB pool budget")
+                continue
+            self.models[size] = loader(size)
+            used_mb += needed_mb
+        return self
+    
+    @property
+    def resident(self):
+        """Loaded sizes from smallest to largest"""
+        return [size for size in MODEL_SIZES if size in self.models]
+    
+    def route(self, duration):
+        """Pick the model size for a clip of the given length in seconds"""
+        if duration <= self.short_seconds:
+            return self.resident[0]
+        return self.default_size
+    
+    def transcribe(self, audio, **params):
+        """Transcribe with the routed model, escalating once on low confidence"""
+        if isinstance(audio, str):
+            audio = self.models[self.default_size].load_audio(audio)
+        
+        size = self.route(len(audio) / self.rate)
+        result = self.models[size].transcribe(audio, **params)
+        
+        larger = [other for other in self.resident if MODEL_SIZES.index(other) > MODEL_SIZES.index(size)]
+        if (self.escalate_logprob is not None and larger
+                and mean_logprob(result) < self.escalate_logprob):
+            size = larger[0]
+            result = self.models[size].transcribe(audio, **params)
+        
+        result["model"] = size
+        return result
+
+
+# transcribe() options that a single decode_mels call can honour
+DECODE_PARAMS = {"language", "task", "temperature", "initial_prompt", "fp16", "verbose",
+                 "beam_size", "patience", "length_penalty", "suppress_tokens", "suppress_blank",
+                 "no_speech_threshold", "logprob_threshold", "compression_ratio_threshold",
+                 "condition_on_previous_text", "without_timestamps", "sample_len", "best_of"}
+
+
+def decodes_directly(model, params):
+    """Whether decode_mels can stand in for model.transcribe with these options"""
+    return ("torch_model" in getattr(model, "capabilities", ())
+            and set(params) <= DECODE_PARAMS
+            and isinstance(params.get("temperature", 0.0), (int, float)))
+
+
+def clip_mel(audio, n_mels=80):
+    """Log-mel features of a clip of at most 30 s, framed as transcribe() frames them
+    
+    The clip's own frames (computed with zeros after its end) are normalized
+    together with the padding and then zero-padded to 30 s.
+    """
+    import whisper
+    from whisper.audio import N_FRAMES, N_SAMPLES
+    
+    mel = whisper.log_mel_spectrogram(audio, n_mels, padding=N_SAMPLES)
+    return whisper.pad_or_trim(mel[:, :mel.shape[-1] - N_FRAMES], N_FRAMES)
+
+
+def decode_mels(model, mels, durations, params):
+    """Batched equivalent of model.transcribe for 30 s log-mel windows
+    
+    mels are (n_mels, 3000) features from clip_mel or LogMelStream, run through
+    one encoder forward and one batched decode (whisper.decode). Returns one
+    transcribe()-style result per clip.
+    """
+    import torch
+    import whisper
+    
+    whisper_model = model.model
+    fp16 = params.get("fp16", True) and whisper_model.device.type != "cpu"
+    prompt = params.get("initial_prompt")
+    if prompt:
+        # The same accent prompt comes with every utterance; encode it once
+        prompt = model.prompt_tokens(prompt, params.get("language"), params.get("task", "transcribe"))
+    mel = torch.stack([torch.as_tensor(each) for each in mels])
+    mel = mel.to(whisper_model.device).to(torch.float16 if fp16 else torch.float32)
+    
+    options = whisper.DecodingOptions(
+        task=params.get("task", "transcribe"),
+        language=params.get("language"),
+        temperature=params.get("temperature", 0.0),
+        beam_size=params.get("beam_size"),
+        patience=params.get("patience"),
+        length_penalty=params.get("length_penalty"),
+        best_of=params.get("best_of"),
+        sample_len=params.get("sample_len"),
+        without_timestamps=params.get("without_timestamps", False),
+        suppress_tokens=params.get("suppress_tokens", "-1"),
+        suppress_blank=params.get("suppress_blank", True),
+        prompt=prompt,
+        fp16=fp16,
+    )
+    decoded = whisper.decode(whisper_model, mel, options)
+    
+    no_speech_threshold = params.get("no_speech_threshold", 0.6)
+    logprob_threshold = params.get("logprob_threshold", -1.0)
+    results = []
+    for duration, result in zip(durations, decoded):
+        silent = (no_speech_threshold is not None and result.no_speech_prob > no_speech_threshold
+                  and (logprob_threshold is None or result.avg_logprob <= logprob_threshold))
+        segments = [] if silent else _decoded_segments(whisper_model, result, duration)
+        results.append({"text": "".join(segment["text"] for segment in segments),
+                        "segments": segments, "language": result.language})
+    return results
+
+
+def _decoded_segments(whisper_model, result, duration):
+    """Split decoded tokens into segments at timestamp tokens, as transcribe() does"""
+    import whisper
+    
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        whisper_model.is_multilingual, num_languages=whisper_model.num_languages,
+        language=result.language, task="transcribe")
+    begin = tokenizer.timestamp_begin
+    tokens = result.tokens
+    is_timestamp = [token >= begin for token in tokens]
+    
+    # Consecutive timestamp tokens close one segment and open the next
+    cuts = [i for i in range(1, len(tokens)) if is_timestamp[i - 1] and is_timestamp[i]]
+    if cuts:
+        segments, last = [], 0
+        for cut in cuts + [len(tokens)]:
+            sliced = tokens[last:cut]
+            if not all(is_timestamp[last:cut]):
+                # Text after the last timestamp runs to the end of the clip
+                start = (sliced[0] - begin) * 0.02 if is_timestamp[last] else 0.0
+                end = (sliced[-1] - begin) * 0.02 if is_timestamp[cut - 1] else duration
+                segments.append((start, end, sliced))
+            last = cut
+    else:
+        timestamps = [token for token in tokens if token >= begin]
+        end = duration
+        if timestamps and timestamps[-1] != begin:
+            end = (timestamps[-1] - begin) * 0.02
+        segments = [(0.0, end, tokens)] if tokens else []
+    
+    return [{
+        "id": i,
+        "seek": 0,
+        "start": start,
+        "end": min(end, duration),
+        "text": tokenizer.decode([token for token in tokens if token < tokenizer.eot]),  # No special tokens
+        "tokens": tokens,
+        "temperature": result.temperature,
+        "avg_logprob": result.avg_logprob,
+        "compression_ratio": result.compression_ratio,
+        "no_speech_prob": result.no_speech_prob,
+    } for i, (start, end, tokens) in enumerate(segments)]
+
+
+class LogMelStream:
+    """Whisper's log-mel features, computed while the audio is being captured
+    
+    Frames whose 400-sample window lies inside the recording are computed with
+    numpy as samples arrive. On release only the few frames at the edges of the
+    (possibly trimmed) clip are computed before normalizing, so the spectrogram
+    no longer adds a cost proportional to clip length after the key is released.
+    Only the first 30 s are computed during capture, the most Whisper reads.
+    The result matches clip_mel() for clips of up to 30 s.
+    """
+    
+    N_FFT = 400
+    HOP = 160
+    N_FRAMES = 3000  # 30 s
+    
+    def __init__(self, filters):
+        self.filters = np.asarray(filters, dtype=np.float32)  # (n_mels, N_FFT // 2 + 1)
+        self.window = np.hanning(self.N_FFT + 1)[:-1].astype(np.float32)  # Periodic, as torch.hann_window
+        self._frames = np.empty((self.N_FRAMES, len(self.filters)), dtype=np.float32)
+        self._next = 2  # Frames 0 and 1 reach before the clip start, computed on release
+    
+    @classmethod
+    def for_model(cls, model):
+        """Stream for a model with the "torch_model" capability"""
+        from whisper.audio import mel_filters
+        return cls(mel_filters("cpu", model.model.dims.n_mels).numpy())
+    
+    def _log_mel(self, signal, count):
+        """Raw log10 mel of `count` frames, frame t covering signal[t * HOP:t * HOP + N_FFT]"""
+        if count <= 0:
+            return np.empty((0, len(self.filters)), dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(signal, self.N_FFT)[::self.HOP][:count]
+        spectrum = np.fft.rfft(windows * self.window, axis=-1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        return np.log10(np.maximum(power @ self.filters.T, 1e-10))
+    
+    def update(self, buffer):
+        """Compute every frame of the first 30 s the buffer now holds the full window for"""
+        # Later frames only matter when trimming moves a clip's start past 0; features()
+        # computes those on release rather than spectrogramming a long recording
+        last = min((len(buffer) - self.N_FFT // 2) // self.HOP, self.N_FRAMES - 1)
+        if last < self._next:
+            return
+        
+        signal = buffer.view(self._next * self.HOP - self.N_FFT // 2, last * self.HOP + self.N_FFT // 2)
+        self._frames[self._next:last + 1] = self._log_mel(signal, last + 1 - self._next)
+        self._next = last + 1
+    
+    def features(self, buffer, start=0, end=None):
+        """Normalized (n_mels, 3000) features of buffer[start:end]
+        
+        start must fall on a frame boundary (a multiple of HOP, as find_speech
+        trims). Returns None when the clip is not between 400 samples and 30 s.
+        """
+        end = len(buffer) if end is None else end
+        n = end - start
+        if start % self.HOP or not self.N_FFT < n <= self.N_FRAMES * self.HOP:
+            return None
+        self.update(buffer)
+        
+        half = self.N_FFT // 2
+        offset = start // self.HOP
+        touching = -(-(n + half) // self.HOP)  # Frames that overlap the clip at all
+        first, last = 2, min((n - half) // self.HOP, self._next - 1 - offset)
+        last = max(last, first - 1)
+        
+        raw = np.empty((touching, len(self.filters)), dtype=np.float32)
+        raw[first:last + 1] = self._frames[offset + first:offset + last + 1]
+        clip = buffer.view(start, end)
+        # Leading frames see the clip reflected at its start, trailing ones see zeros
+        raw[:first] = self._log_mel(np.pad(clip[:first * self.HOP + half], (half, 0), mode="reflect"), first)
+        tail = np.concatenate([clip[(last + 1) * self.HOP - half:], np.zeros(self.N_FFT, dtype=np.float32)])
+        raw[last + 1:] = self._log_mel(tail, touching - last - 1)
+        
+        # Padding frames are log10(1e-10) = -10, which never lowers the peak
+        content = n // self.HOP
+        peak = max(raw.max(), -10.0)
+        features = np.zeros((len(self.filters), self.N_FRAMES), dtype=np.float32)
+        features[:, :content] = (np.maximum(raw[:content], peak - 8.0).T + 4.0) / 4.0
+        return features
+
+
+class _BatchRequest:
+    """One transcribe() call waiting on a BatchScheduler"""
+    
+    def __init__(self, audio, params, features=None):
+        self.audio = audio
+        self.params = params
+        self.features = features
+        self.key = tuple(sorted((name, repr(value)) for name, value in params.items()))
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchScheduler:
+    """Merges concurrent transcribe() calls into batched forward passes
+    
+    Clips of up to 30 s that are waiting at the same time with the same options
+    are run through one encoder forward and one batched decode (decode_mels). A
+    lone request waits at most max_wait_ms for company. Longer clips, file paths,
+    temperature fallback, beam search and best-of sampling, and models without
+    the "torch_model" capability run through model.transcribe as before, under
+    the same lock.
+    """
+    
+    def __init__(self, model, lock=None, max_batch=8, max_wait_ms=10):
+        self.model = model
+        self.lock = lock or threading.Lock()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0  # Forward passes run, and clips they covered
+        self.batched_clips = 0
+        self._requests = queue.Queue()
+        self._thread = None
+        if "torch_model" in getattr(model, "capabilities", ()) and max_batch > 1:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+    
+    def _batchable(self, audio, params):
+        import whisper
+        # whisper.decode can't run beam search or best-of sampling over a batch of clips
+        return (self._thread is not None and isinstance(audio, np.ndarray)
+                and len(audio) <= whisper.audio.N_SAMPLES
+                and not params.get("beam_size") and not params.get("best_of")
+                and decodes_directly(self.model, params))
+    
+    def transcribe(self, audio, features=None, **params):
+        """Same call and result as model.transcribe; features are optional LogMelStream output"""
+        if not self._batchable(audio, params):
+            with self.lock:
+                return self.model.transcribe(audio, **params)
+        
+        request = _BatchRequest(audio, params, features)
+        self._requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+    
+    def close(self):
+        """Stop the batching thread so it no longer holds the model; later calls run unbatched"""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        closing = False
+        while not closing:
+            request = self._requests.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._requests.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True  # Finish what was already submitted, then stop
+                    break
+                batch.append(request)
+            
+            # Only requests with identical options can share a decode
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+            for requests in groups.values():
+                try:
+                    with self.lock:
+                        mels = [request.features if request.features is not None
+                                else clip_mel(request.audio, self.model.model.dims.n_mels)
+                                for request in requests]
+                        results = decode_mels(self.model, mels,
+                                              [len(request.audio) / 16000 for request in requests],
+                                              requests[0].params)
+                    self.batches += 1
+                    self.batched_clips += len(requests)
+                    for request, result in zip(requests, results):
+                        request.result = result
+                except Exception as e:
+                    for request in requests:
+                        request.error = e
+                finally:
+                    for request in requests:
+                        request.done.set()
+
+
+def frame_levels(audio, frame):
+    """Level in dBFS of each complete frame of `frame` samples"""
+    n_frames = len(audio) // frame
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    return 10 * np.log10(energy + 1e-10)
+
+
+def quietest_point(audio, rate=16000, frame_ms=30):
+    """Sample offset of the middle of the quietest frame, a safe place to cut"""
+    frame = int(rate * frame_ms / 1000)
+    level_db = frame_levels(audio, frame)
+    if len(level_db) == 0:
+        return len(audio)
+    return int(np.argmin(level_db)) * frame + frame // 2
+
+
+def find_speech(audio, rate=16000, threshold_db=-45.0, margin_db=12.0, frame_ms=30, pad_ms=250):
+    """Locate speech in a float32 clip using per-frame energy
+    
+    A frame counts as speech when its level is above both threshold_db (dBFS) and
+    the clip's own noise floor plus margin_db. Returns (start, end, speech_seconds)
+    with start/end in samples, padded by pad_ms, or None if no frame is speech.
+    """
+    frame = int(rate * frame_ms / 1000)
+    level_db = frame_levels(audio, frame)
+    if len(level_db) == 0:
+        return None
+    
+    noise_floor = np.percentile(level_db, 10)
+    speech = level_db > max(threshold_db, noise_floor + margin_db)
+    speech_frames = np.flatnonzero(speech)
+    if len(speech_frames) == 0:
+        return None
+    
+    pad = int(rate * pad_ms / 1000)
+    start = max(0, int(speech_frames[0]) * frame - pad)
+    end = min(len(audio), (int(speech_frames[-1]) + 1) * frame + pad)
+    return start, end, len(speech_frames) * frame / rate
+
+
+class SilenceSegmenter:
+    """Split a continuous float32 stream into utterances at pauses
+    
+    Uses the same per-frame energy test as find_speech, against a noise floor
+    tracked as a slowly rising minimum. A segment closes after silence_ms of
+    non-speech (or at max_seconds) and keeps pad_ms of context on both sides.
+    """
+    
+    def __init__(self, rate=16000, threshold_db=-45.0, margin_db=12.0, frame_ms=30,
+                 silence_ms=600, pad_ms=250, min_speech=0.2, max_seconds=30):
+        self.rate = rate
+        self.frame = int(rate * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.floor_rise = 0.05  # dB per frame the noise floor drifts up when not at a new minimum
+        self.silence_frames = silence_ms // frame_ms
+        self.pad_frames = pad_ms // frame_ms
+        self.min_speech_frames = int(min_speech * 1000 / frame_ms)
+        self.max_frames = int(max_seconds * 1000 / frame_ms)
+        
+        self._pending = np.empty(0, dtype=np.float32)  # Samples short of a full frame
+        self._frames = []  # Frames of the open segment, or leading pad while idle
+        self._start = 0  # Stream position (samples) of self._frames[0]
+        self._speech = 0  # Speech frames in the open segment, 0 while idle
+        self._silent = 0  # Consecutive non-speech frames at the end of the segment
+        self._floor = None
+    
+    def feed(self, samples):
+        """Add samples; returns [(start_sample, audio)] for segments that closed"""
+        data = np.concatenate((self._pending, samples))
+        n_frames = len(data) // self.frame
+        self._pending = data[n_frames * self.frame:]
+        framed = data[:n_frames * self.frame]
+        
+        segments = []
+        for frame, level in zip(framed.reshape(n_frames, self.frame), frame_levels(framed, self.frame)):
+            if self._floor is None or level < self._floor:
+                self._floor = level
+            else:
+                self._floor += self.floor_rise
+            speech = level > max(self.threshold_db, self._floor + self.margin_db)
+            
+            self._frames.append(frame)
+            if not self._speech:
+                if speech:
+                    self._speech, self._silent = 1, 0
+                elif len(self._frames) > self.pad_frames:
+                    self._frames.pop(0)
+                    self._start += self.frame
+                continue
+            
+            if speech:
+                self._speech += 1
+                self._silent = 0
+            else:
+                self._silent += 1
+            if self._silent >= self.silence_frames or len(self._frames) >= self.max_frames:
+                segments.extend(self._close())
+        return segments
+    
+    def flush(self):
+        """Close the open segment at end of stream"""
+        return self._close() if self._speech else []
+    
+    def _close(self):
+        frames = self._frames[:len(self._frames) - max(0, self._silent - self.pad_frames)]
+        segment = (self._start, np.concatenate(frames)) if self._speech >= self.min_speech_frames else None
+        self._start += len(self._frames) * self.frame
+        self._frames = []
+        self._speech = self._silent = 0
+        return [segment] if segment else []
+
+
+def format_timestamp(seconds):
+    """HH:MM:SS.mmm"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    return f"{hours:02d}:{minutes:02d}:{millis / 1000:06.3f}"
+
+
+def cache_dir():
+    """Per-user directory for HoldScribe logs, metrics and cached model files"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "holdscribe")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class Telemetry:
+    """Per-utterance metrics: a rotating JSONL log plus cumulative counters and histograms
+    
+    Counters and histograms are exposed in Prometheus text format, written to
+    metrics_path after every utterance and/or served on 127.0.0.1:metrics_port.
+    """
+    
+    # Histogram bucket upper bounds, per recorded field
+    BUCKETS = {
+        "queue_wait_seconds": (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+        "inference_seconds": (0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+        "paste_seconds": (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+        "latency_seconds": (0.25, 0.5, 1, 2, 5, 10, 30),
+        "audio_seconds": (0.5, 1, 2, 5, 10, 30, 60, 300),
+        "real_time_factor": (0.05, 0.1, 0.2, 0.5, 1, 2),
+        "model_reload_seconds": (0.1, 0.25, 0.5, 1, 2, 5),
+        "model_wait_seconds": (0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+    }
+    
+    def __init__(self, log_path=None, metrics_path=None, metrics_port=None,
+                 max_bytes=5 * 1024 * 1024, backup_count=3):
+        import logging
+        import logging.handlers
+        
+        self.metrics_path = metrics_path
+        self.lock = threading.Lock()
+        self.outcomes = {}
+        self.totals = {"trimmed_seconds": 0.0}  # Everything else is covered by histogram sums
+        self.histograms = {name: [0] * (len(bounds) + 1) for name, bounds in self.BUCKETS.items()}
+        self.sums = {name: 0.0 for name in self.BUCKETS}
+        
+        self.logger = None
+        if log_path:
+            self.logger = logging.getLogger(f"holdscribe.telemetry.{log_path}")
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+        
+        if metrics_port:
+            self._serve_metrics(metrics_port)
+    
+    def record(self, **fields):
+        """Log one utterance and fold it into the counters"""
+        if fields.get("inference_seconds") and fields.get("audio_seconds"):
+            fields["real_time_factor"] = fields["inference_seconds"] / fields["audio_seconds"]
+        fields = {key: round(value, 4) if isinstance(value, float) else value
+                  for key, value in fields.items()}
+        fields["time"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        
+        if self.logger:
+            self.logger.info(json.dumps(fields, ensure_ascii=False))
+        
+        with self.lock:
+            outcome = fields.get("outcome", "unknown")
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            for name in self.totals:
+                self.totals[name] += fields.get(name) or 0.0
+            for name, bounds in self.BUCKETS.items():
+                value = fields.get(name)
+                if value is None:
+                    continue
+                self.sums[name] += value
+                index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+                self.histograms[name][index] += 1
+            metrics = self.render()
+        
+        if self.metrics_path:
+            # Write then rename so readers never see a half-written file
+            temp_path = self.metrics_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(metrics)
+            os.replace(temp_path, self.metrics_path)
+    
+    def render(self):
+        """Counters and histograms in Prometheus text exposition format"""
+        lines = ["# TYPE holdscribe_utterances_total counter"]
+        for outcome, count in sorted(self.outcomes.items()):
+            lines.append(f'holdscribe_utterances_total{{outcome="{outcome}"}} {count}')
+        for name, total in self.totals.items():
+            lines.append(f"# TYPE holdscribe_{name}_total counter")
+            lines.append(f"holdscribe_{name}_total {total:.4f}")
+        
+        for name, bounds in self.BUCKETS.items():
+            lines.append(f"# TYPE holdscribe_{name} histogram")
+            cumulative = 0
+            for bound, count in zip(bounds, self.histograms[name]):
+                cumulative += count
+                lines.append(f'holdscribe_{name}_bucket{{le="{bound}"}} {cumulative}')
+            cumulative += self.histograms[name][-1]
+            lines.append(f'holdscribe_{name}_bucket{{le="+Inf"}} {cumulative}')
+            lines.append(f"holdscribe_{name}_sum {self.sums[name]:.4f}")
+            lines.append(f"holdscribe_{name}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+    
+    def _serve_metrics(self, port):
+        """Serve render() over HTTP on localhost from a daemon thread"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        telemetry = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with telemetry.lock:
+                    body = telemetry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of stderr
+        
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+
+class AudioBuffer:
+    """Growable float32 sample buffer filled from int16 PCM chunks as they arrive
+    
+    Chunks are converted once on append, so the finished recording can be handed
+    to Whisper as an array without joining bytes or writing a WAV file. Past
+    spill_seconds, samples move to an unnamed temporary file and views become
+    read-only memory maps of it, so memory use no longer grows with the recording.
+    """
+    
+    def __init__(self, initial_seconds=30, rate=16000, spill_seconds=300):
+        self.rate = rate
+        self.spill_samples = int(spill_seconds * rate) if spill_seconds else None
+        capacity = int(initial_seconds * rate)
+        if self.spill_samples:
+            capacity = min(capacity, self.spill_samples)
+        self._samples = np.empty(capacity, dtype=np.float32)
+        self._length = 0
+        self._spill_file = None
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self._length
+    
+    @property
+    def spilled(self):
+        """Whether samples now live in the temporary file"""
+        return self._spill_file is not None
+    
+    def append(self, data):
+        """Convert an int16 PCM chunk to float32 and append it"""
+        pcm = np.frombuffer(data, dtype=np.int16)
+        with self._lock:
+            end = self._length + len(pcm)
+            if self._spill_file is None and self.spill_samples and end > self.spill_samples:
+                self._spill()
+            
+            if self._spill_file is not None:
+                self._spill_file.write((pcm * np.float32(1 / 32768)).tobytes())
+                self._length = end
+                return
+            
+            if end > len(self._samples):
+                # Double the capacity so appends stay amortized O(1)
+                grown = np.empty(max(end, 2 * len(self._samples)), dtype=np.float32)
+                if self.spill_samples:
+                    grown = grown[:max(end, min(len(grown), self.spill_samples))]
+                grown[:self._length] = self._samples[:self._length]
+                self._samples = grown
+            np.multiply(pcm, np.float32(1 / 32768), out=self._samples[self._length:end])
+            self._length = end
+    
+    def _spill(self):
+        """Move the samples captured so far into the temporary file"""
+        self._spill_file = tempfile.TemporaryFile(prefix="holdscribe-")
+        self._spill_file.write(self._samples[:self._length].tobytes())
+        self._samples = None  # Existing views keep their own reference
+    
+    def view(self, start=0, end=None):
+        """Return samples [start, end) without copying
+        
+        Views stay valid while recording continues since appends only write past
+        the current length and growing swaps in a new array.
+        """
+        with self._lock:
+            end = self._length if end is None else min(end, self._length)
+            if self._spill_file is None:
+                return self._samples[start:end]
+            
+            if end <= start:
+                return np.empty(0, dtype=np.float32)
+            self._spill_file.flush()
+            return np.memmap(self._spill_file, dtype=np.float32, mode="r",
+                             offset=start * 4, shape=(end - start,))
+    
+    def close(self):
+        """Release the samples and delete the temporary file, if any"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+            self._samples = None
+
+
+def synthetic_speech(seconds, seed=0, rate=16000):
+    """Speech-like float32 audio: voiced harmonics with syllable-rate envelopes
+    and short pauses, over a low noise floor"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.3 * t) > -0.7)
+    audio = 0.1 * voiced * envelope + 0.002 * rng.standard_normal(len(t))
+    
+    # Half a second of silence on both sides, as with a real key press
+    silence = 0.002 * rng.standard_normal(rate // 2)
+    return np.concatenate([silence, audio, silence]).astype(np.float32)
+
+
+class Resampler:
+    """Streaming polyphase resampler with channel downmix, e.g. 48 kHz stereo to 16 kHz mono
+    
+    A windowed-sinc low-pass filter is split into `up` phases, so each output
+    sample is one short dot product and a whole chunk is one vectorized gather
+    and multiply. The last input samples are kept between chunks, so chunked
+    output equals resampling the whole signal at once. The filter is centered:
+    output sample n lines up with input time n / out_rate, and the final few
+    output samples come out with the next chunk or flush().
+    """
+    
+    def __init__(self, in_rate, out_rate=16000, channels=1, zero_crossings=16, rolloff=0.95, beta=8.0):
+        from math import gcd
+        
+        common = gcd(int(in_rate), int(out_rate))
+        self.up, self.down = int(out_rate) // common, int(in_rate) // common
+        self.channels = channels
+        self._in = 0  # Input frames and output samples so far, for flush()
+        self._out = 0
+        if self.up == self.down:
+            return  # Downmix only
+        
+        # Low-pass below the lower Nyquist rate, designed at the upsampled rate in_rate * up
+        factor = max(self.up, self.down)
+        self.half = zero_crossings * factor
+        offsets = np.arange(-self.half, self.half + 1)
+        cutoff = rolloff / (2 * factor)
+        taps = 2 * cutoff * np.sinc(2 * cutoff * offsets) * np.kaiser(len(offsets), beta) * self.up
+        
+        # bank[p, j] weights input sample i - (K - 1) + j for outputs at phase p
+        self.taps = -(-len(taps) // self.up)
+        padded = np.zeros(self.taps * self.up)
+        padded[:len(taps)] = taps
+        self.bank = np.ascontiguousarray(padded.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32)
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._t = (self.taps - 1) * self.up + self.half  # Next output, in upsampled units from _history[0]
+    
+    def process(self, samples):
+        """Resample interleaved int16 or float frames; returns mono of the same dtype"""
+        samples = np.asarray(samples)
+        dtype = samples.dtype
+        mono = samples.astype(np.float32)
+        if self.channels > 1:
+            mono = mono.reshape(-1, self.channels).mean(axis=1)
+        self._in += len(mono)
+        if self.up == self.down:
+            out = mono
+        else:
+            out = self._filter(mono)
+        self._out += len(out)
+        return self._as(out, dtype)
+    
+    def flush(self, dtype=np.float32):
+        """The output samples still held back by the filter, at the end of the input"""
+        if self.up == self.down:
+            return np.empty(0, dtype=dtype)
+        expected = -(-self._in * self.up // self.down)
+        out = self._filter(np.zeros(self.half // self.up + 1, dtype=np.float32))[:expected - self._out]
+        self._out += len(out)
+        return self._as(out, dtype)
+    
+    def _filter(self, mono):
+        x = np.concatenate([self._history, mono])
+        count = max(0, (len(x) * self.up - 1 - self._t) // self.down + 1)
+        if count:
+            t = self._t + np.arange(count) * self.down
+            start = t // self.up - (self.taps - 1)
+            windows = np.lib.stride_tricks.sliding_window_view(x, self.taps)[start]
+            out = np.einsum("nk,nk->n", windows, self.bank[t % self.up])
+        else:
+            out = np.empty(0, dtype=np.float32)
+        
+        drop = max(0, len(x) - (self.taps - 1))
+        self._t += count * self.down - drop * self.up
+        self._history = x[drop:]
+        return out
+    
+    @staticmethod
+    def _as(out, dtype):
+        if dtype == np.int16:
+            return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+        return out.astype(np.float32, copy=False)
+
+
+class AudioSource:
+    """Where recordings get their audio from: 16 kHz mono int16 PCM chunks"""
+    
+    name = None
+    
+    def __init__(self, rate=16000):
+        self.rate = rate
+    
+    def chunks(self, frames):
+        """Yield chunks of up to `frames` samples as int16 bytes for one recording
+        
+        Live sources block until each chunk has been captured. The generator is
+        closed when the recording stops, which releases anything opened for it.
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Release the source"""
+
+
+class MicrophoneSource(AudioSource):
+    """Default input device through PyAudio, one stream per recording
+    
+    The device is opened at its native rate (or capture_rate) and channel
+    count, and each chunk is converted to 16 kHz mono in-process by a
+    Resampler, since many USB and Bluetooth devices reject 16 kHz or convert
+    it poorly on the host side.
+    """
+    
+    name = "mic"
+    
+    def __init__(self, rate=16000, capture_rate=None):
+        import pyaudio
+        super().__init__(rate)
+        self.format = pyaudio.paInt16
+        self.audio = pyaudio.PyAudio()
+        self.capture_rate, self.channels = self._input_format(capture_rate)
+    
+    def _input_format(self, capture_rate=None):
+        """(rate, channels) the default input device accepts, preferring its native rate and mono"""
+        try:
+            info = self.audio.get_default_input_device_info()
+        except IOError:
+            return capture_rate or self.rate, 1  # No input device; opening the stream reports it
+        rates = [capture_rate] if capture_rate else [int(info["defaultSampleRate"]), self.rate]
+        for rate in rates:
+            for channels in sorted({1, min(2, max(1, int(info["maxInputChannels"])))}):
+                try:
+                    if self.audio.is_format_supported(rate, input_device=info["index"],
+                                                      input_channels=channels, input_format=self.format):
+                        return rate, channels
+                except ValueError:
+                    continue  # Unsupported combinations raise instead of returning False
+        return rates[0], 1
+    
+    def resampler(self):
+        """A fresh Resampler from the capture format to 16 kHz mono"""
+        return Resampler(self.capture_rate, self.rate, self.channels)
+    
+    def chunks(self, frames):
+        # Same chunk duration at the capture rate
+        capture_frames = frames * self.capture_rate // self.rate
+        resampler = self.resampler()
+        stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.capture_rate,
+            input=True,
+            frames_per_buffer=capture_frames
+        )
+        try:
+            while True:
+                data = stream.read(capture_frames, exception_on_overflow=False)
+                if self.capture_rate == self.rate and self.channels == 1:
+                    yield data
+                else:
+                    yield resampler.process(np.frombuffer(data, dtype=np.int16)).tobytes()
+        finally:
+            stream.stop_stream()
+            stream.close()
+    
+    def close(self):
+        self.audio.terminate()
+
+
+class ReplaySource(AudioSource):
+    """Replays fixed audio from the start on every recording
+    
+    Chunks are released at real-time pace, as a microphone would deliver them,
+    so the trigger timing decides how much of the audio each recording gets.
+    """
+    
+    name = "replay"
+    
+    def __init__(self, audio, rate=16000, realtime=True):
+        super().__init__(rate)
+        if audio.dtype != np.int16:
+            audio = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+        self.samples = audio
+        self.realtime = realtime
+    
+    def chunks(self, frames):
+        started = time.perf_counter()
+        for position in range(0, len(self.samples), frames):
+            chunk = self.samples[position:position + frames]
+            if self.realtime:
+                delay = started + (position + len(chunk)) / self.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield chunk.tobytes()
+
+
+class WavFileSource(ReplaySource):
+    """Replays a 16-bit WAV file, downmixed to mono and resampled if needed"""
+    
+    name = "wav"
+    
+    def __init__(self, path, rate=16000, realtime=True):
+        import wave
+        
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            channels = wf.getnchannels()
+            file_rate = wf.getframerate()
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        
+        resampler = Resampler(file_rate, rate, channels)
+        audio = np.concatenate([resampler.process(pcm / np.float32(32768)), resampler.flush()])
+        super().__init__(audio, rate, realtime)
+
+
+class SyntheticSource(ReplaySource):
+    """Replays generated speech-like audio, for runs without any input files"""
+    
+    name = "synthetic"
+    
+    def __init__(self, seconds=5.0, rate=16000, realtime=True, seed=0):
+        super().__init__(synthetic_speech(seconds, seed, rate), rate, realtime)
+
+
+class StdinSource(AudioSource):
+    """Raw 16 kHz mono s16le PCM piped on stdin, paced by whatever writes it
+    
+    The pipe is read only while recording; a writer feeding it in real time
+    blocks in between, so no audio is lost or buffered without bound.
+    """
+    
+    name = "stdin"
+    
+    def __init__(self, rate=16000, stream=None):
+        super().__init__(rate)
+        self.stream = stream if stream is not None else sys.stdin.buffer
+    
+    def chunks(self, frames):
+        while True:
+            data = self.stream.read(frames * 2)
+            if len(data) < 2:
+                return
+            yield data[:len(data) // 2 * 2]
+
+
+AUDIO_SOURCES = {
+    "mic": MicrophoneSource,
+    "wav": WavFileSource,
+    "synthetic": SyntheticSource,
+    "stdin": StdinSource,
+}
+
+
+def create_audio_source(spec="mic", rate=16000):
+    """Build an AudioSource from a spec: mic[:RATE], wav:PATH, synthetic[:SECONDS] or stdin"""
+    name, _, value = spec.partition(":")
+    if name not in AUDIO_SOURCES:
+        raise ValueError(f"unknown audio source '{name}' (choose from {', '.join(AUDIO_SOURCES)})")
+    if name == "wav":
+        if not value:
+            raise ValueError("wav source needs a path, e.g. wav:speech.wav")
+        return WavFileSource(value, rate)
+    if name == "synthetic" and value:
+        return SyntheticSource(float(value), rate)
+    if name == "mic" and value:
+        return MicrophoneSource(rate, capture_rate=int(value))
+    return AUDIO_SOURCES[name](rate=rate)
+
+
+class ScriptedTrigger:
+    """Presses and releases the trigger on a fixed schedule instead of the keyboard
+    
+    The script is a list of (wait, hold) pairs in seconds: wait, start a
+    recording, hold, stop it. Together with a replay source this drives the
+    whole pipeline deterministically, e.g. for profiling on a headless machine.
+    """
+    
+    def __init__(self, script):
+        self.script = script
+    
+    @classmethod
+    def parse(cls, text):
+        """Parse "WAIT:HOLD,WAIT:HOLD,..." or @FILE with one WAIT:HOLD per line"""
+        if text.startswith("@"):
+            with open(text[1:]) as f:
+                text = ",".join(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        
+        script = []
+        for step in text.split(","):
+            wait, _, hold = step.strip().partition(":")
+            try:
+                script.append((float(wait), float(hold)))
+            except ValueError:
+                raise ValueError(f"bad trigger step '{step.strip()}', expected WAIT:HOLD in seconds")
+        return script
+    
+    def run(self, app):
+        """Play the script against a HoldScribe and wait for every transcription"""
+        for wait, hold in self.script:
+            time.sleep(wait)
+            app.start_recording()
+            time.sleep(hold)
+            app.stop_recording()
+        app.job_queue.join()
+
+
+class RingBuffer:
+    """Fixed-size int16 ring written by a single audio callback
+    
+    Samples are addressed by absolute position (total samples written so far).
+    The writer never takes a lock: it fills the slots first and only then
+    advances `position`, so readers can copy anything below it that has not
+    yet been lapped.
+    """
+    
+    def __init__(self, seconds, rate=16000):
+        self._data = np.zeros(int(seconds * rate), dtype=np.int16)
+        self.position = 0
+    
+    def write(self, pcm):
+        """Append samples, overwriting the oldest ones (producer side)"""
+        size = len(self._data)
+        pcm = pcm[-size:]
+        start = self.position % size
+        first = min(len(pcm), size - start)
+        self._data[start:start + first] = pcm[:first]
+        self._data[:len(pcm) - first] = pcm[first:]
+        self.position += len(pcm)
+    
+    def read(self, start):
+        """Copy samples from `start` up to the write position
+        
+        Returns the samples and the position to continue from. Positions older
+        than what the ring still holds (less a quarter kept clear of the writer)
+        are skipped.
+        """
+        end = self.position
+        size = len(self._data)
+        start = max(start, 0, end - size + size // 4)
+        if start >= end:
+            return np.empty(0, dtype=np.int16), end
+        
+        first, last = start % size, end % size
+        if first < last:
+            return self._data[first:last].copy(), end
+        return np.concatenate((self._data[first:], self._data[:last])), end
+
+
+class ContinuousCapture:
+    """One always-open, callback-driven input stream feeding a RingBuffer
+    
+    Keeping the stream open removes the device open cost from every key press
+    and lets a recording start with audio from just before the press.
+    """
+    
+    def __init__(self, audio, rate=16000, chunk=1024, ring_seconds=10, capture_rate=None, channels=1):
+        import pyaudio
+        
+        capture_rate = capture_rate or rate
+        self.ring = RingBuffer(ring_seconds, rate)
+        self.overflows = 0  # Callbacks PortAudio flagged as having dropped input
+        self.resampler = None  # Converts to 16 kHz mono when the device runs at another format
+        if capture_rate != rate or channels > 1:
+            self.resampler = Resampler(capture_rate, rate, channels)
+        self._overflow_flag = pyaudio.paInputOverflow
+        self._continue = pyaudio.paContinue
+        self.stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=channels,
+            rate=capture_rate,
+            input=True,
+            frames_per_buffer=chunk * capture_rate // rate,
+            stream_callback=self._callback
+        )
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        if status & self._overflow_flag:
+            self.overflows += 1
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        self.ring.write(self.resampler.process(samples) if self.resampler else samples)
+        return None, self._continue
+    
+    def close(self):
+        """Stop and close the stream"""
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        except Exception:
+            pass
+
+
+class TextInjector:
+    """Sends text to the focused window; kept alive for the whole session"""
+    
+    def type_text(self, text):
+        """Type text at the cursor"""
+        raise NotImplementedError
+    
+    def paste_shortcut(self):
+        """Send the platform paste shortcut (Cmd+V / Ctrl+V)"""
+        raise NotImplementedError
+    
+    def get_clipboard(self):
+        return pyperclip.paste()
+    
+    def set_clipboard(self, text):
+        pyperclip.copy(text)
+
+
+class KeyboardInjector(TextInjector):
+    """In-process pynput keyboard controller, so no process is spawned per utterance"""
+    
+    def __init__(self):
+        from pynput.keyboard import Controller, Key
+        self.controller = Controller()
+        self.paste_modifier = Key.cmd if platform.system() == "Darwin" else Key.ctrl
+    
+    def type_text(self, text):
+        self.controller.type(text)
+    
+    def paste_shortcut(self):
+        with self.controller.pressed(self.paste_modifier):
+            self.controller.press('v')
+            self.controller.release('v')
+
+
+class SubprocessInjector(TextInjector):
+    """osascript / xdotool per call, as in earlier releases"""
+    
+    def type_text(self, text):
+        if platform.system() == "Darwin":
+            # Escape for the AppleScript string literal so quotes don't break the script
+            escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+            script = f'tell application "System Events" to keystroke "{escaped}"'
+            subprocess.run(["osascript", "-e", script], check=True)
+        else:
+            subprocess.run(["xdotool", "type", "--", text], check=True)
+    
+    def paste_shortcut(self):
+        if platform.system() == "Darwin":
+            script = 'tell application "System Events" to keystroke "v" using command down'
+            subprocess.run(["osascript", "-e", script], check=True)
+        else:
+            subprocess.run(["xdotool", "key", "ctrl+v"], check=True)
+
+
+class StubInjector(TextInjector):
+    """Records what would have been typed, with timestamps, for headless runs and benchmarks"""
+    
+    def __init__(self, echo=False):
+        self.echo = echo
+        self.events = []  # (perf_counter time, action, text)
+        self.clipboard = ""
+    
+    def type_text(self, text):
+        self.events.append((time.perf_counter(), "type", text))
+        if self.echo:
+            print(f"⌨️  {text}")
+    
+    def paste_shortcut(self):
+        self.events.append((time.perf_counter(), "paste", self.clipboard))
+        if self.echo:
+            print(f"⌨️  {self.clipboard}")
+    
+    def get_clipboard(self):
+        return self.clipboard
+    
+    def set_clipboard(self, text):
+        self.clipboard = text
+
+
+# Injectors selectable with --injector
+INJECTORS = {
+    "keyboard": KeyboardInjector,
+    "subprocess": SubprocessInjector,
+    "stub": StubInjector,
+}
+
+
+def create_injector(name="auto"):
+    """Create the named injector; "auto" prefers the in-process keyboard controller"""
+    if name != "auto":
+        return INJECTORS[name]()
+    try:
+        return KeyboardInjector()
+    except Exception:
+        # No usable keyboard backend (e.g. no display for pynput), use the tools directly
+        return SubprocessInjector()
+
+
+class PasteEngine:
+    """Delivers transcripts at the cursor through a persistent injector
+    
+    Text of paste_threshold characters or more goes through the clipboard and a
+    single paste shortcut instead of being typed key by key; the previous
+    clipboard contents are restored restore_delay seconds later.
+    """
+    
+    def __init__(self, injector, paste_threshold=200, restore_delay=0.5):
+        self.injector = injector
+        self.paste_threshold = paste_threshold
+        self.restore_delay = restore_delay
+        self.lock = threading.Lock()
+        self.saved_clipboard = None  # Clipboard contents to restore, while a restore is pending
+        self.restore_timer = None
+    
+    def paste(self, text):
+        """Type or paste text at the cursor"""
+        with self.lock:
+            if len(text) >= self.paste_threshold:
+                self._paste_via_clipboard(text)
+            else:
+                self.injector.type_text(text)
+    
+    def _paste_via_clipboard(self, text):
+        # A pending restore still holds the user's clipboard, so keep that one
+        if self.restore_timer:
+            self.restore_timer.cancel()
+        else:
+            try:
+                self.saved_clipboard = self.injector.get_clipboard()
+            except Exception:
+                self.saved_clipboard = None
+        
+        self.injector.set_clipboard(text)
+        self.injector.paste_shortcut()
+        
+        # Restore later so the target app reads our text before it changes back
+        self.restore_timer = threading.Timer(self.restore_delay, self._restore_clipboard)
+        self.restore_timer.daemon = True
+        self.restore_timer.start()
+    
+    def _restore_clipboard(self):
+        with self.lock:
+            if self.saved_clipboard is not None:
+                try:
+                    self.injector.set_clipboard(self.saved_clipboard)
+                except Exception:
+                    pass
+            self.saved_clipboard = None
+            self.restore_timer = None
+
+
+class OrderedOutput:
+    """Pastes text pieces strictly in recording order
+    
+    Each recording has a sequence number. Pieces for a later recording (e.g.
+    segments streamed while an earlier one is still decoding) are held back
+    until every earlier recording has submitted its final piece.
+    """
+    
+    def __init__(self, paste):
+        self.paste = paste  # Callable taking the text, returns whether it was typed directly
+        self.lock = threading.Lock()
+        self.next_seq = 0
+        self.pending = {}  # seq -> [(text, final)]
+        self.started = set()  # Sequences that already had text typed
+        self.fell_back = set()  # Sequences with a piece that only reached the clipboard
+    
+    def submit(self, seq, text, final=False):
+        """Queue a piece of text for a recording and paste whatever is now in order
+        
+        Returns whether seq was typed directly once its final piece is out,
+        or None while it is still waiting on earlier recordings.
+        """
+        with self.lock:
+            self.pending.setdefault(seq, []).append((text, final))
+            result = None
+            while self.next_seq in self.pending:
+                pieces = self.pending[self.next_seq]
+                while pieces:
+                    text, final = pieces.pop(0)
+                    self._paste_piece(self.next_seq, text)
+                    if final:
+                        break
+                else:
+                    break  # Recording still in progress, wait for more pieces
+                
+                if self.next_seq == seq:
+                    result = seq not in self.fell_back
+                del self.pending[self.next_seq]
+                self.started.discard(self.next_seq)
+                self.fell_back.discard(self.next_seq)
+                self.next_seq += 1
+            return result
+    
+    def _paste_piece(self, seq, text):
+        if seq not in self.started:
+            text = text.lstrip()  # Whisper segments start with a space
+        if text:
+            self.started.add(seq)
+            if not self.paste(text):
+                self.fell_back.add(seq)
+
+
+class Recording:
+    """Audio and streaming state for a single press of the trigger key"""
+    
+    def __init__(self, rate, seq=0, spill_seconds=300):
+        self.seq = seq  # Position in recording order, used to keep pastes ordered
+        self.buffer = AudioBuffer(rate=rate, spill_seconds=spill_seconds)
+        self.active = True  # Capture keeps running until the key is released
+        self.recording_thread = None
+        self.stream_thread = None
+        self.committed = 0  # Samples already covered by committed segments
+        self.segments = []  # Committed segment texts
+        self.released_at = None  # perf_counter() when the trigger key was released
+        self.stats = {}  # Per-utterance telemetry fields
+        self.finalized = False  # Final text handed to the ordered output
+        self.features = None  # LogMelStream filled during capture, when the model can use it
+        self.speech_range = None  # (start, end) samples kept by silence trimming
+        self.preroll = 0  # Samples captured before the key press (--always-on)
+    
+    def append(self, data):
+        """Store a captured chunk and extend the log-mel features over it"""
+        self.buffer.append(data)
+        if self.features is not None:
+            if self.buffer.spilled:
+                self.features = None  # Spilled recordings are transcribed in windows
+            else:
+                self.features.update(self.buffer)
+
+
 class HoldScribe:
-    def __init__(self, trigger_key=Key.alt_r, model_size="base", background_mode=False, prompt_permissions=False, 
-                 language="en", initial_prompt=None):
+    def __init__(self, trigger_key=None, model_size="base", background_mode=False, prompt_permissions=False, 
+                 language="en", initial_prompt=None, streaming=False, stream_interval=2.0, server=None,
+                 vad=True, vad_threshold=-45.0, telemetry=None, model_pool=None,
+                 injector="auto", paste_threshold=200, type_segments=False,
+                 threads=None, interop_threads=None, cpu_affinity=None, warmup=True, quantize=False,
+                 backend="whisper", spill_after=300, always_on=False, preroll=0.5, source="mic",
+                 max_batch=1, max_wait_ms=10, unload_after=None, incremental_mel=True,
+                 profile=DEFAULT_PROFILE):
+        # Heavy imports (pyaudio, pynput, whisper/torch) are deferred to where they
+        # are needed so --help/--version and listener startup stay fast
+        self.created_at = time.perf_counter()
+        self.startup_timings = {}
+        self.startup_reported = False
+        self.startup_lock = threading.Lock()
+        
+        # Pin now, on the main thread, so capture, worker and inference threads inherit it
+        if cpu_affinity:
+            set_cpu_affinity(cpu_affinity)
+        
+        if trigger_key is None:
+            from pynput.keyboard import Key
+            trigger_key = Key.alt_r
         self.trigger_key = trigger_key
         self.background_mode = background_mode
         self.prompt_permissions = prompt_permissions
@@ -106,34 +1970,253 @@ class HoldScribe:
         
         # Default to Indian accent prompt if no initial prompt provided
         if initial_prompt is None:
-            self.initial_prompt = "The following is a transcription of Indian English speech. Common Indian English patterns and pronunciation should be expected."
+            self.initial_prompt = ACCENT_PROMPTS["indian"]
         else:
             self.initial_prompt = initial_prompt
+        self.profile = profile  # Decoding strategy and time budget (see PROFILES)
         self.is_recording = False
-        self.audio_queue = queue.Queue()
-        self.recording_thread = None
+        self.recording = None  # Recording currently being captured
+        self.job_queue = queue.Queue()  # Finished recordings waiting for transcription
+        self.model_lock = threading.Lock()  # Serializes inference across threads
         self.permission_granted = True  # Track current permission state
         self.ctrl_pressed = False  # Track Ctrl key state for exit combination
         
+        # Streaming transcription state (only used when streaming is enabled)
+        self.streaming = streaming
+        self.stream_interval = stream_interval  # Seconds of new audio between rolling decodes
+        self.stream_margin = 1.0  # Segments ending this close to the window edge are not yet stable
+        
+        # Text delivery: one persistent injector, pastes kept in recording order
+        self.paste_engine = PasteEngine(
+            create_injector(injector) if isinstance(injector, str) else injector, paste_threshold)
+        self.output = OrderedOutput(self._paste_text)
+        self.type_segments = type_segments  # Type committed streaming segments while still recording
+        self.recording_count = 0
+        
+        # Optional per-utterance metrics (see Telemetry)
+        self.telemetry = telemetry
+        
+        # Voice activity detection applied before inference
+        self.vad = vad
+        self.vad_threshold = vad_threshold  # dBFS a frame must exceed to count as speech
+        self.min_duration = 0.3  # Shorter recordings are accidental taps of the trigger key
+        self.min_speech = 0.2  # Seconds of speech needed before the model is invoked
+        
+        # Compute log-mel features while recording so only the encoder runs after release
+        self.incremental_mel = incremental_mel
+        
+        # Long recordings spill to disk and are transcribed window by window
+        self.spill_after = spill_after  # Seconds kept in memory before spilling (0 = never)
+        self.window_seconds = 30  # Whisper's native input length
+        
         # Audio settings
         self.chunk = 1024
-        self.format = pyaudio.paInt16
-        self.channels = 1
         self.rate = 16000  # Whisper works best with 16kHz
         
         # Initialize audio
-        self.audio = pyaudio.PyAudio()
+        self.source = create_audio_source(source, self.rate) if isinstance(source, str) else source
+        if (isinstance(self.source, MicrophoneSource) and not self.background_mode
+                and (self.source.capture_rate != self.rate or self.source.channels > 1)):
+            print(f"🎙️  Capturing at {self.source.capture_rate} Hz, {self.source.channels} channel(s), "
+                  f"resampled to {self.rate // 1000} kHz mono")
         
-        # Load Whisper model
-        if not self.background_mode:
-            print(f"Loading AI model '{model_size}'...")
-        self.model = whisper.load_model(model_size)
-        if not self.background_mode:
-            print("Model loaded successfully!")
+        # Optional always-open input stream; recordings copy from its ring buffer
+        # starting `preroll` seconds before the key press
+        self.preroll = preroll
+        self.capture = None
+        if always_on and not isinstance(self.source, MicrophoneSource):
+            print(f"⚠️  --always-on needs the microphone source, ignored for '{self.source.name}'")
+        elif always_on:
+            try:
+                self.capture = ContinuousCapture(self.source.audio, self.rate, self.chunk,
+                                                 ring_seconds=preroll + 10,
+                                                 capture_rate=self.source.capture_rate,
+                                                 channels=self.source.channels)
+            except Exception as e:
+                print(f"⚠️  Could not open always-on input stream ({e}), opening one per recording")
+        self.startup_timings["audio init"] = time.perf_counter() - self.created_at
+        
+        # Load Whisper model in the background; recording can start right away and
+        # the first transcription waits on model_ready
+        self.model_size = model_size
+        self.model_pool = model_pool  # Unloaded ModelPool routing between several sizes, if any
+        self.inference_options = {"threads": threads, "interop_threads": interop_threads}
+        self.warmup = warmup
+        self.quantize = quantize
+        self.backend = backend
+        self.server = server  # Socket path of a shared model server, if any
+        self.model = None
+        self.scheduler = None  # BatchScheduler in front of the model when batching is enabled
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.model_error = None
+        self.model_ready = threading.Event()
+        self.model_thread = threading.Thread(target=self._load_model)
+        self.model_thread.daemon = True
+        self.model_thread.start()
+        
+        # Optional idle unload: the model is dropped after unload_after seconds
+        # without recordings and memory-mapped back in on the next key press
+        self.unload_after = None if server else unload_after
+        self.unloaded = False
+        self.last_used = time.perf_counter()
+        self.load_lock = threading.Lock()  # Orders unloading against reloads on key press
+        if self.unload_after:
+            monitor = threading.Thread(target=self._idle_monitor)
+            monitor.daemon = True
+            monitor.start()
+        
+        # Transcription workers so the keyboard listener never waits on inference;
+        # with batching, queued recordings are decoded together and pasted in order
+        self.worker_threads = []
+        for _ in range(max(1, max_batch)):
+            worker = threading.Thread(target=self._transcription_worker)
+            worker.daemon = True
+            worker.start()
+            self.worker_threads.append(worker)
         
         # Keyboard listener
         self.listener = None
         
+    def _load_model(self):
+        """Import Whisper and load the model (runs on a background thread)"""
+        if self.server:
+            self._connect_server()
+            return
+        
+        if not self.background_mode:
+            print(f"Loading AI model '{self.model_size}' in the background...")
+        try:
+            if self.backend == "whisper":
+                started = time.perf_counter()
+                import whisper
+                self.startup_timings["whisper import"] = time.perf_counter() - started
+            configure_inference(**self.inference_options)
+            
+            started = time.perf_counter()
+            model = self._load_weights()
+            self.startup_timings["model load"] = time.perf_counter() - started
+            
+            if self.warmup:
+                # Recordings decode their incremental features directly, and so does the scheduler
+                direct = self.max_batch > 1 or (self.incremental_mel and not self.streaming
+                                                and not self.model_pool)
+                first, steady = warm_up(model, self._transcribe_params(), direct=direct)
+                self.startup_timings["warm-up first call"] = first
+                self.startup_timings["warm-up steady state"] = steady
+            
+            if self.max_batch > 1:
+                self.scheduler = BatchScheduler(model, self.model_lock, self.max_batch, self.max_wait_ms)
+            self.model = model
+            if not self.background_mode:
+                print("Model loaded successfully!")
+        except Exception as e:
+            self.model_error = e
+            print(f"❌ Failed to load model '{self.model_size}': {e}")
+        finally:
+            self.model_ready.set()
+        self._report_startup()
+    
+    def _load_weights(self):
+        """Load the configured model or pool, memory-mapped when it may be reloaded"""
+        mmap = bool(self.unload_after)
+        if self.model_pool:
+            return self.model_pool.load(mmap=mmap)
+        return load_model(self.model_size, quantize=self.quantize, backend=self.backend, mmap=mmap)
+    
+    def _idle_monitor(self):
+        """Unload the model once nothing has been recorded for unload_after seconds"""
+        while True:
+            time.sleep(min(30, self.unload_after / 4))
+            with self.load_lock:
+                idle = time.perf_counter() - self.last_used
+                if (idle < self.unload_after or self.unloaded or self.model is None
+                        or self.is_recording or self.job_queue.unfinished_tasks):
+                    continue
+                if self.scheduler:
+                    self.scheduler.close()  # Its thread takes model_lock, so stop it first
+                with self.model_lock:
+                    self.model_ready.clear()
+                    self.model = None
+                    self.scheduler = None
+                    if self.model_pool:
+                        self.model_pool.models = {}
+                    self.unloaded = True
+            
+            release_memory()
+            if not self.background_mode:
+                print(f"💤 Model unloaded after {idle / 60:.1f} min idle, reloads on the next recording")
+    
+    def _use_model(self, stats=None):
+        """Note model activity, starting a reload if the model was unloaded while idle"""
+        with self.load_lock:
+            self.last_used = time.perf_counter()
+            if self.unloaded:
+                self.unloaded = False
+                self.model_ready.clear()
+                reload_thread = threading.Thread(target=self._reload_model, args=(stats,))
+                reload_thread.daemon = True
+                reload_thread.start()
+    
+    def _reload_model(self, stats=None):
+        """Bring an idle-unloaded model back (runs on a background thread)"""
+        try:
+            started = time.perf_counter()
+            model = self._load_weights()
+            if self.max_batch > 1:
+                self.scheduler = BatchScheduler(model, self.model_lock, self.max_batch, self.max_wait_ms)
+            self.model = model
+            reload_seconds = time.perf_counter() - started
+            if stats is not None:
+                stats["model_reload_seconds"] = reload_seconds
+            if not self.background_mode:
+                print(f"♻️  Model reloaded in {reload_seconds:.2f}s")
+        except Exception as e:
+            self.model_error = e
+            print(f"❌ Failed to reload model '{self.model_size}': {e}")
+            with self.load_lock:
+                self.unloaded = True  # Try again on the next recording
+        finally:
+            self.model_ready.set()
+    
+    def _connect_server(self):
+        """Use the model resident in a `holdscribe serve` process instead of loading one"""
+        try:
+            started = time.perf_counter()
+            model = RemoteModel(self.server)
+            info = model.ping()
+            self.startup_timings["server connect"] = time.perf_counter() - started
+            self.model = model
+            if not self.background_mode:
+                print(f"Using shared model '{info['model']}' from {self.server}")
+        except Exception as e:
+            self.model_error = e
+            print(f"❌ Cannot reach model server at {self.server}: {e}")
+            print("Start one with: holdscribe serve")
+        finally:
+            self.model_ready.set()
+        self._report_startup()
+    
+    def _wait_for_model(self):
+        """Block until the background model load has finished"""
+        if not self.model_ready.is_set():
+            print("⏳ Waiting for model to finish loading...")
+            self.model_ready.wait()
+        if self.model is None:
+            raise RuntimeError(f"model '{self.model_size}' is not available: {self.model_error}")
+    
+    def _report_startup(self):
+        """Print startup timings once both the listener and the model are up"""
+        with self.startup_lock:
+            if self.startup_reported or self.background_mode:
+                return
+            if "listener" not in self.startup_timings or not self.model_ready.is_set():
+                return
+            self.startup_reported = True
+        
+        report = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.startup_timings.items())
+        print(f"⏱️  Startup: {report}")
+    
     def start_recording(self):
         """Start audio recording"""
         if self.is_recording:
@@ -146,154 +2229,382 @@ class HoldScribe:
                 return
             
         self.is_recording = True
-        self.audio_queue = queue.Queue()
+        recording = Recording(self.rate, self.recording_count, self.spill_after)
+        self.recording_count += 1
+        self.recording = recording
+        
+        # Reload an idle-unloaded model while this recording is being captured
+        self._use_model(recording.stats)
+        
+        model = self.model
+        if (self.incremental_mel and not self.streaming and not self.model_pool and model is not None
+                and decodes_directly(model, self._transcribe_params())):
+            recording.features = LogMelStream.for_model(model)
         
         print("🎤 Recording started...")
         
         # Start recording thread
-        self.recording_thread = threading.Thread(target=self._record_audio)
-        self.recording_thread.daemon = True
-        self.recording_thread.start()
+        if self.capture:
+            pressed_at = self.capture.ring.position
+            start = max(0, pressed_at - int(self.preroll * self.rate))
+            recording.preroll = pressed_at - start
+            recording.recording_thread = threading.Thread(target=self._tap_capture, args=(recording, start))
+        else:
+            recording.recording_thread = threading.Thread(target=self._record_audio, args=(recording,))
+        recording.recording_thread.daemon = True
+        recording.recording_thread.start()
+        
+        # Start rolling transcription alongside the recording
+        if self.streaming:
+            recording.stream_thread = threading.Thread(target=self._stream_transcribe, args=(recording,))
+            recording.stream_thread.daemon = True
+            recording.stream_thread.start()
         
     def stop_recording(self):
-        """Stop recording and process audio"""
+        """Stop recording and queue the audio for transcription"""
         if not self.is_recording:
             return
             
         self.is_recording = False
-        print("⏹️  Recording stopped, processing...")
+        self.recording.active = False
+        
+        pending = self.job_queue.qsize()
+        if pending:
+            print(f"⏹️  Recording stopped, queued behind {pending} other recording(s)...")
+        else:
+            print("⏹️  Recording stopped, processing...")
         
-        # Wait for recording thread to finish
-        if self.recording_thread:
-            self.recording_thread.join(timeout=2)
+        # Hand off to the worker so a new recording can start right away
+        self.recording.released_at = time.perf_counter()
+        self.job_queue.put(self.recording)
+        self.recording = None
         
-        # Process the recorded audio
-        self._process_audio()
+    def _transcription_worker(self):
+        """Transcribe finished recordings; with several workers pastes still follow recording order"""
+        while True:
+            recording = self.job_queue.get()
+            if recording is None:
+                self.job_queue.task_done()
+                return
+            
+            recording.stats["queue_wait_seconds"] = time.perf_counter() - recording.released_at
+            try:
+                # Wait for recording thread to finish
+                if recording.recording_thread:
+                    recording.recording_thread.join(timeout=2)
+                
+                # Let an in-flight rolling decode finish so only the tail is left
+                if recording.stream_thread:
+                    recording.stream_thread.join()
+                
+                # Process the recorded audio
+                self._process_audio(recording)
+            except Exception as e:
+                print(f"Error in transcription worker: {e}")
+                recording.stats.update(outcome="error", error=str(e))
+            finally:
+                # Release the output order even when nothing was pasted
+                if not recording.finalized:
+                    self.output.submit(recording.seq, "", final=True)
+                recording.buffer.close()
+                self.last_used = time.perf_counter()
+                recording.stats["latency_seconds"] = time.perf_counter() - recording.released_at
+                if self.telemetry:
+                    self.telemetry.record(**{"model": self.model_size, "streaming": self.streaming,
+                                             **recording.stats})
+                self.job_queue.task_done()
         
-    def _record_audio(self):
+    def _record_audio(self, recording):
         """Record audio in a separate thread"""
+        chunks = self.source.chunks(self.chunk)
         try:
-            stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
-            
-            while self.is_recording:
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    self.audio_queue.put(data)
-                except Exception as e:
-                    print(f"Error recording: {e}")
+            for data in chunks:
+                recording.append(data)
+                if not recording.active:
                     break
-                    
-            stream.stop_stream()
-            stream.close()
-            
         except Exception as e:
-            print(f"Failed to initialize audio stream: {e}")
-            self.is_recording = False
+            if len(recording.buffer):
+                print(f"Error recording: {e}")
+            else:
+                print(f"Failed to initialize audio stream: {e}")
+                recording.active = False
+                if self.recording is recording:
+                    # Never queued for transcription, so give up its place in the output order here
+                    self.is_recording = False
+                    self.recording = None
+                    recording.finalized = True
+                    self.output.submit(recording.seq, "", final=True)
+        finally:
+            chunks.close()
+            
+    def _tap_capture(self, recording, position):
+        """Copy audio from the always-open stream into the recording until release"""
+        overflows = self.capture.overflows
+        while True:
+            active = recording.active
+            samples, position = self.capture.ring.read(position)
+            if len(samples):
+                recording.append(samples)
+            if not active:
+                break
+            time.sleep(0.02)
+        
+        recording.stats["input_overflows"] = self.capture.overflows - overflows
+    
+    def _stream_transcribe(self, recording):
+        """Transcribe audio in rolling windows while the trigger key is held"""
+        interval = int(self.stream_interval * self.rate)
+        decoded_until = 0
+        
+        while recording.active:
+            total = len(recording.buffer)
+            if total - decoded_until < interval:
+                time.sleep(0.05)
+                continue
             
-    def _process_audio(self):
+            decoded_until = total
+            try:
+                window = recording.buffer.view(recording.committed, total)
+                result = self._transcribe(window, stats=recording.stats, field="stream_inference_seconds")
+            except Exception as e:
+                print(f"Error in streaming transcription: {e}")
+                return
+            self._commit_stable_segments(recording, result, len(window))
+    
+    def _commit_stable_segments(self, recording, result, window_samples):
+        """Commit segments that end well before the edge of the decoded window
+        
+        The last segment is always held back since more speech may change it.
+        """
+        stable_until = window_samples / self.rate - self.stream_margin
+        committed_end = 0.0
+        for segment in result.get("segments", [])[:-1]:
+            if segment["end"] > stable_until:
+                break
+            recording.segments.append(segment["text"])
+            committed_end = segment["end"]
+            if self.type_segments:
+                self.output.submit(recording.seq, segment["text"])
+        recording.committed += int(committed_end * self.rate)
+    
+    def _transcribe_params(self):
+        """Build the keyword arguments passed to model.transcribe"""
+        params = build_transcribe_params(self.language, self.initial_prompt, self.profile)
+        if self.streaming:
+            params.pop("without_timestamps", None)  # Rolling decodes commit by segment end time
+        return params
+    
+    def _transcribe(self, audio, features=None, stats=None, field="inference_seconds"):
+        """Run the model on an audio array under the decoding profile
+        
+        features are precomputed log-mel features of the audio (LogMelStream),
+        decoded directly instead of recomputing them inside model.transcribe.
+        With stats, decoding time is added to stats[field] and any wait for the
+        model to load or reload to stats["model_wait_seconds"].
+        """
+        started = time.perf_counter()
+        if self.unload_after:
+            self._use_model()
+        self._wait_for_model()
+        ready = time.perf_counter()
+        result = transcribe_with_profile(
+            lambda audio, **params: self._decode(audio, features, params),
+            audio, self._transcribe_params(), self.profile, self.rate)
+        if stats is not None:
+            stats["model_wait_seconds"] = stats.get("model_wait_seconds", 0.0) + ready - started
+            stats[field] = stats.get(field, 0.0) + time.perf_counter() - ready
+        return result
+    
+    def _decode(self, audio, features, params):
+        """One decode of an audio array, one inference at a time"""
+        if self.scheduler:
+            return self.scheduler.transcribe(audio, features=features, **params)
+        with self.model_lock:
+            if features is not None and decodes_directly(self.model, params):
+                return decode_mels(self.model, [features], [len(audio) / self.rate], params)[0]
+            return self.model.transcribe(audio, **params)
+    
+    def _process_audio(self, recording):
         """Process recorded audio and transcribe"""
-        if self.audio_queue.empty():
+        stats = recording.stats
+        stats["audio_seconds"] = len(recording.buffer) / self.rate
+        if self.streaming:
+            self._process_stream_tail(recording)
+            return
+        
+        audio = recording.buffer.view()
+        if len(audio) == 0:
             print("No audio recorded")
+            stats["outcome"] = "no_audio"
             return
-            
-        # Collect all audio data
-        audio_data = []
-        while not self.audio_queue.empty():
-            audio_data.append(self.audio_queue.get())
-            
-        if not audio_data:
-            print("No audio data to process")
+        
+        # Pre-roll is not part of the key press, so it doesn't rescue an accidental tap
+        if len(audio) - recording.preroll < self.min_duration * self.rate:
+            print("Recording too short, ignored")
+            stats["outcome"] = "too_short"
+            return
+        
+        if recording.buffer.spilled:
+            self._process_long_recording(recording)
+            return
+        
+        audio = self._trim_silence(audio, recording)
+        if audio is None:
             return
-            
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_filename = temp_file.name
             
         try:
-            # Write WAV file
-            with wave.open(temp_filename, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(audio_data))
-            
-            # Transcribe with AI
+            # Transcribe with AI straight from the capture buffer
             print("🤖 Transcribing...")
-            # Optimized transcription parameters for speed and Indian accent
-            transcribe_params = {
-                "language": self.language,
-                "task": "transcribe",
-                "temperature": 0.0,  # More deterministic output
-            }
-            
-            # Add initial prompt if specified (helps with accent/context)
-            if self.initial_prompt:
-                transcribe_params["initial_prompt"] = self.initial_prompt
-            
-            result = self.model.transcribe(temp_filename, **transcribe_params)
-            text = result["text"].strip()
-            
-            if text:
-                print(f"📝 Transcribed: '{text}'")
-                self._paste_text(text)
-            else:
-                print("No speech detected")
+            features = None
+            if recording.features is not None:
+                started = time.perf_counter()
+                start, end = recording.speech_range or (0, len(recording.buffer))
+                features = recording.features.features(recording.buffer, start, end)
+                stats["feature_seconds"] = stats["inference_seconds"] = time.perf_counter() - started
+            result = self._transcribe(audio, features, stats)
+            stats["decode_attempts"] = result["attempts"]
+            if result["degraded"]:
+                stats["budget_exhausted"] = True
+            if "model" in result:
+                stats["model"] = result["model"]
+            self._finish_transcription(recording, result["text"])
                 
         except Exception as e:
             print(f"Error processing audio: {e}")
-            
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-                
-    def _paste_text(self, text):
-        """Paste text at current cursor position"""
+            stats.update(outcome="error", error=str(e))
+    
+    def _process_long_recording(self, recording):
+        """Transcribe a spilled recording in windows read straight from its file
+        
+        Windows end at the quietest point of their last two seconds so words are
+        not cut in half; only one window is ever copied into memory.
+        """
+        stats = recording.stats
+        buffer = recording.buffer
+        total = len(buffer)
+        window = self.window_seconds * self.rate
+        texts = []
+        stats.update(inference_seconds=0.0, trimmed_seconds=0.0)
+        
+        print(f"🤖 Transcribing {total / self.rate:.0f}s recording in {self.window_seconds}s windows...")
+        start = 0
         try:
-            # Method 1: Try direct typing (works in most applications)
-            if platform.system() == "Darwin":  # macOS
-                # Use AppleScript for reliable pasting on macOS
-                script = f'''
-                tell application "System Events"
-                    keystroke "{text}"
-                end tell
-                '''
-                subprocess.run(["osascript", "-e", script], check=True)
+            while start < total:
+                end = min(start + window, total)
+                if end < total:
+                    search = 2 * self.rate
+                    end = end - search + quietest_point(buffer.view(end - search, end), self.rate)
                 
-            elif platform.system() == "Linux":
-                # Use xdotool for Linux
-                subprocess.run(["xdotool", "type", text], check=True)
+                audio = np.array(buffer.view(start, end))
+                if self.vad:
+                    speech = find_speech(audio, self.rate, threshold_db=self.vad_threshold)
+                else:
+                    speech = (0, len(audio), len(audio) / self.rate)
+                if speech is None or speech[2] < self.min_speech:
+                    stats["trimmed_seconds"] += len(audio) / self.rate
+                else:
+                    stats["trimmed_seconds"] += (len(audio) - (speech[1] - speech[0])) / self.rate
+                    texts.append(self._transcribe(audio[speech[0]:speech[1]], stats=stats)["text"])
+                start = end
+        except Exception as e:
+            print(f"Error processing audio: {e}")
+            stats.update(outcome="error", error=str(e))
+        
+        self._finish_transcription(recording, "".join(texts))
+    
+    def _process_stream_tail(self, recording):
+        """Decode only the audio after the last committed segment"""
+        stats = recording.stats
+        total = len(recording.buffer)
+        if total == 0 and not recording.segments:
+            print("No audio recorded")
+            stats["outcome"] = "no_audio"
+            return
+        
+        tail_text = ""
+        stats["inference_seconds"] = 0.0
+        try:
+            # Anything shorter than a tenth of a second is not worth a decode
+            if total - recording.committed >= self.rate // 10:
+                tail = self._trim_silence(recording.buffer.view(recording.committed, total), recording)
+                if tail is not None:
+                    print("🤖 Transcribing tail...")
+                    tail_text = self._transcribe(tail, stats=stats)["text"]
+        except Exception as e:
+            print(f"Error processing audio: {e}")
+            stats.update(outcome="error", error=str(e))
+        
+        text = "".join(recording.segments) + tail_text
+        if text.strip() or "outcome" not in stats:
+            self._finish_transcription(recording, text)
+    
+    def _trim_silence(self, audio, recording):
+        """Trim leading/trailing silence, or return None if there is no speech"""
+        if not self.vad:
+            return audio
+        
+        speech = find_speech(audio, self.rate, threshold_db=self.vad_threshold)
+        if speech is None or speech[2] < self.min_speech:
+            print("No speech detected, skipped transcription")
+            recording.stats.update(outcome="no_speech", trimmed_seconds=len(audio) / self.rate)
+            return None
+        
+        start, end, _ = speech
+        recording.speech_range = (start, end)
+        removed = (len(audio) - (end - start)) / self.rate
+        recording.stats["trimmed_seconds"] = removed
+        if removed > 0:
+            print(f"✂️  Trimmed {removed:.2f}s of silence ({len(audio) / self.rate:.2f}s → {(end - start) / self.rate:.2f}s)")
+        return audio[start:end]
+    
+    def _finish_transcription(self, recording, text):
+        """Report and paste a finished transcription"""
+        remaining = text
+        if self.type_segments and recording.segments:
+            # Committed segments were already typed while recording
+            remaining = text[len("".join(recording.segments)):]
+        
+        text = text.strip()
+        recording.stats["characters"] = len(text)
+        if text:
+            print(f"📝 Transcribed: '{text}'")
+            started = time.perf_counter()
+            pasted = self.output.submit(recording.seq, remaining, final=True)
+            recording.finalized = True
+            recording.stats["paste_seconds"] = time.perf_counter() - started
+            if pasted is None:
+                # Pasted later, once every earlier recording has finished
+                recording.stats["outcome"] = "deferred"
+            else:
+                recording.stats["outcome"] = "pasted" if pasted else "clipboard"
+        else:
+            print("No speech detected")
+            recording.stats["outcome"] = "no_speech"
                 
-            else:  # Windows fallback
-                # Copy to clipboard and paste
-                pyperclip.copy(text)
-                time.sleep(0.1)
-                # Simulate Ctrl+V
-                from pynput.keyboard import Controller
-                kbd = Controller()
-                with kbd.pressed(Key.ctrl):
-                    kbd.press('v')
-                    kbd.release('v')
-                    
-        except (subprocess.CalledProcessError, Exception) as e:
+    def _paste_text(self, text):
+        """Paste text at current cursor position
+        
+        Returns False if the text could only be copied to the clipboard.
+        """
+        try:
+            self.paste_engine.paste(text)
+            return True
+        except Exception as e:
             # Fallback: copy to clipboard
             if isinstance(e, subprocess.CalledProcessError):
                 print("Direct typing failed, copied to clipboard instead")
             else:
                 print(f"Error pasting text: {e}")
-            pyperclip.copy(text)
-            print("📋 Text copied to clipboard - paste with Cmd+V")
+            try:
+                pyperclip.copy(text)
+                print("📋 Text copied to clipboard - paste with Cmd+V")
+            except Exception as e:
+                print(f"Clipboard unavailable: {e}")
+            return False
     
     def on_key_press(self, key):
         """Handle key press events"""
+        from pynput.keyboard import Key
         if key == self.trigger_key:
             self.start_recording()
         elif key in (Key.ctrl, Key.ctrl_l, Key.ctrl_r):
@@ -301,6 +2612,7 @@ class HoldScribe:
             
     def on_key_release(self, key):
         """Handle key release events"""
+        from pynput.keyboard import Key
         if key == self.trigger_key:
             self.stop_recording()
         elif key in (Key.ctrl, Key.ctrl_l, Key.ctrl_r):
@@ -311,6 +2623,8 @@ class HoldScribe:
             
     def start_listener(self):
         """Start the keyboard listener"""
+        from pynput import keyboard
+        
         if not self.background_mode:
             print(f"HoldScribe ready! 🎤")
             print(f"Hold {self.trigger_key} to record, release to transcribe")
@@ -328,17 +2642,93 @@ class HoldScribe:
                 suppress=False  # Don't suppress other key events
             ) as listener:
                 self.listener = listener
+                self.startup_timings["listener"] = time.perf_counter() - self.created_at
+                self._report_startup()
                 listener.join()
         except Exception as e:
             if not self.background_mode:
                 print(f"Error starting listener: {e}")
             # In background mode, fail silently or log to a file
             
+    def run_script(self, trigger):
+        """Drive recordings from a ScriptedTrigger instead of the keyboard"""
+        if not self.background_mode:
+            print(f"HoldScribe ready! 🎤 Replaying {len(trigger.script)} scripted recording(s) "
+                  f"from '{self.source.name}'")
+        self.startup_timings["listener"] = time.perf_counter() - self.created_at
+        self._report_startup()
+        trigger.run(self)
+    
+    def stream_continuous(self, output=None, max_pending=4):
+        """Transcribe the audio source continuously, writing one timestamped line per utterance
+        
+        Utterances are split on silence and handed to the model through a bounded
+        queue: when inference falls behind, reading stops until it catches up, so
+        a piped producer is held back instead of audio piling up in memory.
+        """
+        output = output or sys.stdout
+        segmenter = SilenceSegmenter(self.rate, self.vad_threshold, min_speech=self.min_speech,
+                                     max_seconds=self.window_seconds)
+        pending = queue.Queue(maxsize=max_pending)
+        
+        def transcribe_segments():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                start, audio, queued_at = item
+                stats = {"model": self.model_size, "streaming": True,
+                         "queue_wait_seconds": time.perf_counter() - queued_at,
+                         "audio_seconds": len(audio) / self.rate}
+                try:
+                    text = self._transcribe(audio, stats=stats)["text"].strip()
+                    stats.update(characters=len(text), outcome="transcribed" if text else "no_speech")
+                    if text:
+                        end = start + len(audio)
+                        output.write(f"[{format_timestamp(start / self.rate)} --> "
+                                     f"{format_timestamp(end / self.rate)}] {text}\n")
+                        output.flush()
+                except Exception as e:
+                    print(f"Error transcribing segment: {e}")
+                    stats.update(outcome="error", error=str(e))
+                if self.telemetry:
+                    self.telemetry.record(**stats)
+        
+        worker = threading.Thread(target=transcribe_segments)
+        worker.daemon = True
+        worker.start()
+        
+        if not self.background_mode:
+            print(f"HoldScribe streaming from '{self.source.name}' 🎤 (transcripts on stdout)")
+        behind = False
+        for data in self.source.chunks(self.chunk):
+            samples = np.frombuffer(data, dtype=np.int16) * np.float32(1 / 32768)
+            for start, audio in segmenter.feed(samples):
+                if pending.full() and not behind:
+                    behind = True
+                    print("⏳ Transcription is falling behind the input, pausing reads")
+                pending.put((start, audio, time.perf_counter()))  # Blocks while the queue is full
+        for start, audio in segmenter.flush():
+            pending.put((start, audio, time.perf_counter()))
+        
+        pending.put(None)
+        worker.join()
+    
     def cleanup(self):
         """Clean up resources"""
-        self.is_recording = False
-        if self.audio:
-            self.audio.terminate()
+        if self.is_recording:
+            self.stop_recording()
+        
+        # Let queued recordings finish transcribing before shutting down
+        for _ in self.worker_threads:
+            self.job_queue.put(None)
+        deadline = time.perf_counter() + 30
+        for worker in self.worker_threads:
+            worker.join(timeout=max(0, deadline - time.perf_counter()))
+        if self.capture:
+            self.capture.close()
+        if self.source:
+            self.source.close()
     
     def _check_runtime_permissions(self):
         """Check permissions at runtime with user prompt"""
@@ -375,6 +2765,430 @@ class HoldScribe:
         return granted
 
 
+def default_socket_path():
+    """Per-user location of the shared model server socket"""
+    import getpass
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(runtime_dir, f"holdscribe-{user}.sock")
+
+
+# Where --socket and --server default to, resolved when a command runs
+DEFAULT_SOCKET_HELP = "$XDG_RUNTIME_DIR/holdscribe-UID.sock"
+
+# Unix sockets don't exist on Windows, where `holdscribe serve` refuses to start
+_UnixStreamServer = getattr(socketserver, "UnixStreamServer", object)
+
+
+# Segment fields sent back to clients (the rest, like token ids, stay server side)
+SEGMENT_FIELDS = ("id", "start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob")
+
+
+class _ModelRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one request: a JSON header line, optionally followed by float32 samples"""
+    
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.handle_request_message(request, self.rfile)
+        except Exception as e:
+            response = {"error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class ModelServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """Keeps one model resident and serves transcription requests over a Unix socket"""
+    
+    daemon_threads = True
+    
+    def __init__(self, socket_path, model, model_size, max_batch=1, max_wait_ms=10):
+        self.model = model
+        self.model_size = model_size
+        self.model_lock = threading.Lock()
+        # Requests from concurrent clients are batched together when enabled
+        self.scheduler = BatchScheduler(model, self.model_lock, max_batch, max_wait_ms)
+        super().__init__(socket_path, _ModelRequestHandler)
+        os.chmod(socket_path, 0o600)  # Only the owning user may transcribe
+    
+    def handle_request_message(self, request, rfile):
+        """Run one request and return the JSON-serializable response"""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "model": self.model_size, "version": __version__}
+        
+        params = request.get("params", {})
+        if op == "transcribe":
+            payload = rfile.read(request["samples"] * 4)
+            audio = np.frombuffer(payload, dtype=np.float32)
+        elif op == "transcribe_file":
+            audio = request["path"]  # Decoded by the backend
+        else:
+            raise ValueError(f"unknown op: {op}")
+        
+        result = self.scheduler.transcribe(audio, **params)
+        return {
+            "text": result["text"],
+            "language": result.get("language"),
+            "segments": [{key: segment.get(key) for key in SEGMENT_FIELDS}
+                         for segment in result.get("segments", [])],
+        }
+
+
+class RemoteModel:
+    """Client for a ModelServer with the same transcribe() call as a Whisper model"""
+    
+    def __init__(self, socket_path=None, timeout=300):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+    
+    def _request(self, header, payload=b""):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not available on this platform")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(header).encode() + b"\n" + payload)
+            with sock.makefile("rb") as reader:
+                response = json.loads(reader.readline())
+        if "error" in response:
+            raise RuntimeError(f"model server: {response['error']}")
+        return response
+    
+    def ping(self):
+        """Check the server is up and return its model info"""
+        return self._request({"op": "ping"})
+    
+    def transcribe(self, audio, **params):
+        """Transcribe a float32 16 kHz array or an audio file path"""
+        if isinstance(audio, str):
+            return self._request({"op": "transcribe_file", "path": os.path.abspath(audio), "params": params})
+        
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        header = {"op": "transcribe", "samples": len(audio), "params": params}
+        return self._request(header, audio.tobytes())
+
+
+def _add_model_arguments(parser):
+    """Add the model selection options shared by commands that load a model"""
+    parser.add_argument("--model", default="base",
+                       choices=["tiny", "base", "small", "medium", "large"],
+                       help="AI model size (default: base)")
+    parser.add_argument("--backend", default="whisper", choices=sorted(BACKENDS),
+                       help="Inference engine: openai-whisper or CTranslate2-based faster-whisper "
+                            "(pip install faster-whisper) (default: whisper)")
+    parser.add_argument("--quantize", action="store_true",
+                       help="Run an int8 dynamically quantized model on CPU (converted once and cached)")
+    parser.add_argument("--pool", metavar="SIZES",
+                       help="Keep these extra model sizes resident too (e.g. tiny,small) and route "
+                            "short clips to the smallest")
+    parser.add_argument("--pool-budget-mb", type=int,
+                       help="Memory budget for the model pool; sizes that don't fit are not loaded")
+    parser.add_argument("--route-short", type=float, default=3.0, metavar="SECONDS",
+                       help="Clips up to this long go to the smallest pooled model (default: 3.0)")
+    parser.add_argument("--escalate-logprob", type=float, metavar="LOGPROB",
+                       help="Redo pooled results below this mean token log probability (e.g. -0.8) "
+                            "on the next larger model")
+
+
+def _add_inference_arguments(parser):
+    """Add CPU tuning and warm-up options for commands that run inference in-process"""
+    parser.add_argument("--threads", type=int,
+                       help="Torch intra-op threads used for inference (default: torch's choice)")
+    parser.add_argument("--interop-threads", type=int,
+                       help="Torch inter-op threads (default: torch's choice)")
+    parser.add_argument("--cpu-affinity", type=parse_cpu_list, metavar="CPUS",
+                       help="Pin the process to these CPUs, e.g. 0-3 or 2,3 (Linux only)")
+    parser.add_argument("--no-warmup", action="store_true",
+                       help="Skip the warm-up transcriptions after loading the model")
+    parser.add_argument("--max-batch", type=int, default=1, metavar="N",
+                       help="Decode up to N waiting clips in one batched forward pass "
+                            "(whisper backend, default: 1 = no batching)")
+    parser.add_argument("--max-wait-ms", type=float, default=10, metavar="MS",
+                       help="How long a lone clip waits for others to batch with (default: 10)")
+
+
+def _model_pool_from_args(args):
+    """Build the (unloaded) ModelPool requested on the command line, if any"""
+    if not args.pool:
+        return None
+    sizes = [size.strip() for size in args.pool.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in MODEL_SIZES]
+    if unknown:
+        raise SystemExit(f"Unknown model size(s) in --pool: {', '.join(unknown)}")
+    return ModelPool(args.model, sizes, args.pool_budget_mb, args.route_short, args.escalate_logprob,
+                     quantize=args.quantize, backend=args.backend)
+
+
+def _add_language_arguments(parser):
+    """Add the language, prompt and decoding options shared by every command"""
+    parser.add_argument("--language", default="en",
+                       help="Language code for transcription (default: en)")
+    parser.add_argument("--accent", choices=["indian", "american", "british", "australian"],
+                       help="Accent optimization (default: indian, adds contextual prompting)")
+    parser.add_argument("--initial-prompt", type=str,
+                       help="Custom initial prompt to guide transcription style/context")
+    parser.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                       help="Decoding profile: fast (greedy, no timestamps, output capped by clip length "
+                            "for English and similar languages), balanced (one greedy decode, as before "
+                            "profiles existed) or accurate (beam search and temperature fallback within a "
+                            "15s per-utterance budget) (default: %(default)s)")
+
+
+def _resolve_initial_prompt(args):
+    """Determine the initial prompt - default to Indian accent if none specified"""
+    initial_prompt = args.initial_prompt
+    if not initial_prompt:
+        # Default to Indian accent if no accent specified and no custom prompt
+        accent_to_use = args.accent if args.accent else "indian"
+        initial_prompt = ACCENT_PROMPTS.get(accent_to_use)
+    return initial_prompt
+
+
+def serve_main(argv):
+    """`holdscribe serve`: keep one model resident for every client on this host"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog="holdscribe serve",
+        description="Keep one Whisper model loaded and share it over a local Unix socket"
+    )
+    _add_model_arguments(parser)
+    _add_inference_arguments(parser)
+    parser.add_argument("--socket", help=f"Unix socket path (default: {DEFAULT_SOCKET_HELP})")
+    args = parser.parse_args(argv)
+    args.socket = args.socket or default_socket_path()
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ holdscribe serve needs Unix sockets, which this platform lacks")
+        sys.exit(1)
+    
+    # Refuse to steal the socket from a running server, but clear stale ones
+    if os.path.exists(args.socket):
+        try:
+            RemoteModel(args.socket, timeout=2).ping()
+        except OSError:
+            os.unlink(args.socket)  # Nothing is listening
+        except Exception as e:
+            print(f"❌ Something other than a model server answers on {args.socket} ({e})")
+            print("Stop it or pass another --socket")
+            sys.exit(1)
+        else:
+            print(f"❌ A model server is already listening on {args.socket}")
+            sys.exit(1)
+    
+    pool = _model_pool_from_args(args)
+    configure_inference(args.threads, args.interop_threads, args.cpu_affinity)
+    print(f"Loading AI model '{args.model}'...")
+    model = pool.load() if pool else load_model(args.model, quantize=args.quantize, backend=args.backend)
+    if not args.no_warmup:
+        first, steady = warm_up(model, build_transcribe_params("en"), direct=args.max_batch > 1,
+                                batch=args.max_batch)
+        print(f"🔥 Warm-up: first call {first:.2f}s, steady state {steady:.2f}s")
+    model_name = f"{args.model} (pool: {','.join(pool.resident)})" if pool else args.model
+    
+    server = ModelServer(args.socket, model, model_name, args.max_batch, args.max_wait_ms)
+    print(f"✅ Serving '{args.model}' on {args.socket} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
+        try:
+            os.unlink(args.socket)
+        except OSError:
+            pass
+
+
+def transcribe_main(argv):
+    """`holdscribe transcribe FILE...`: transcribe files with the shared model server"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog="holdscribe transcribe",
+        description="Transcribe audio files using a running `holdscribe serve` process"
+    )
+    parser.add_argument("files", nargs="+", metavar="FILE", help="Audio files to transcribe")
+    _add_language_arguments(parser)
+    parser.add_argument("--socket",
+                       help=f"Unix socket path of the model server (default: {DEFAULT_SOCKET_HELP})")
+    args = parser.parse_args(argv)
+    args.socket = args.socket or default_socket_path()
+    
+    model = RemoteModel(args.socket)
+    params = build_transcribe_params(args.language, _resolve_initial_prompt(args), args.profile)
+    failed = False
+    for path in args.files:
+        try:
+            result = transcribe_with_profile(model.transcribe, path, params, args.profile)
+        except OSError as e:
+            print(f"❌ Cannot reach model server at {args.socket}: {e}", file=sys.stderr)
+            print("Start one with: holdscribe serve", file=sys.stderr)
+            sys.exit(1)
+        except RuntimeError as e:
+            print(f"❌ {path}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        
+        text = result["text"].strip()
+        print(f"{path}: {text}" if len(args.files) > 1 else text)
+    
+    if failed:
+        sys.exit(1)
+
+
+# File types picked up when a directory is passed to `holdscribe batch`
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".m4a", ".ogg", ".opus", ".webm")
+
+# Per-process state of batch workers, set up once by _batch_worker_init
+_batch_model = None
+_batch_params = None
+_batch_profile = DEFAULT_PROFILE
+_batch_error = None
+
+
+def _collect_audio_files(paths):
+    """Expand files and directories into a sorted list of audio file paths"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        else:
+            files.append(path)
+    return sorted(os.path.abspath(path) for path in files)
+
+
+def _read_completed(output_path):
+    """Paths already transcribed successfully in a previous (possibly partial) run"""
+    completed = set()
+    if not output_path or not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Last line may be cut short if the run was interrupted
+            if "error" not in record:
+                completed.add(record["path"])
+    return completed
+
+
+def _batch_worker_init(model_size, params, threads, model_pool=None, quantize=False, backend="whisper",
+                       profile=DEFAULT_PROFILE):
+    """Load one model (or model pool) per worker process"""
+    global _batch_model, _batch_params, _batch_profile, _batch_error
+    _batch_params = params
+    _batch_profile = profile
+    try:
+        configure_inference(threads=threads)
+        _batch_model = model_pool.load() if model_pool else load_model(model_size, quantize, backend)
+    except Exception as e:
+        # Report per file instead of letting the pool respawn failing workers forever
+        _batch_error = f"failed to load model '{model_size}': {e}"
+
+
+def _batch_transcribe(path):
+    """Transcribe one file inside a worker process and return its JSONL record"""
+    if _batch_error:
+        return {"path": path, "error": _batch_error}
+    
+    started = time.perf_counter()
+    try:
+        result = transcribe_with_profile(_batch_model.transcribe, path, _batch_params, _batch_profile)
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "text": result["text"].strip(),
+        "language": result.get("language"),
+        "model": result.get("model"),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def batch_main(argv):
+    """`holdscribe batch PATH...`: transcribe files in parallel and stream JSONL results"""
+    import argparse
+    import multiprocessing
+    
+    parser = argparse.ArgumentParser(
+        prog="holdscribe batch",
+        description="Transcribe audio files and directories across a pool of worker processes"
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="Audio files or directories")
+    _add_model_arguments(parser)
+    _add_language_arguments(parser)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                       help="Worker processes, each holding one model (default: number of cores)")
+    parser.add_argument("--output", "-o",
+                       help="Append JSONL results to this file instead of printing them")
+    parser.add_argument("--resume", action="store_true",
+                       help="Skip files already transcribed successfully in --output")
+    args = parser.parse_args(argv)
+    if args.resume and not args.output:
+        parser.error("--resume needs --output, the file holding the previous run's results")
+    
+    files = _collect_audio_files(args.paths)
+    if args.resume:
+        completed = _read_completed(args.output)
+        files = [path for path in files if path not in completed]
+        print(f"Resuming: {len(completed)} file(s) already done", file=sys.stderr)
+    if not files:
+        print("Nothing to transcribe", file=sys.stderr)
+        return
+    
+    # Split the cores between workers so torch threads don't oversubscribe them
+    workers = max(1, min(args.workers, len(files)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    params = build_transcribe_params(args.language, _resolve_initial_prompt(args), args.profile)
+    print(f"Transcribing {len(files)} file(s) with {workers} worker(s) "
+          f"running '{args.model}'...", file=sys.stderr)
+    
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        # Spawn rather than fork so workers don't inherit threads or torch state
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers, initializer=_batch_worker_init,
+                          initargs=(args.model, params, threads, _model_pool_from_args(args),
+                                    args.quantize, args.backend, args.profile)) as pool:
+            for done, record in enumerate(pool.imap_unordered(_batch_transcribe, files), 1):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if "error" in record:
+                    failed += 1
+                    print(f"❌ [{done}/{len(files)}] {record['path']}: {record['error']}", file=sys.stderr)
+                else:
+                    print(f"[{done}/{len(files)}] {record['path']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    if failed:
+        print(f"{failed} file(s) failed", file=sys.stderr)
+        sys.exit(1)
+
+
+def _detached_telemetry_args(args):
+    """Telemetry options for a detached child, whose stdout/stderr go to DEVNULL"""
+    extra = []
+    if not args.telemetry_log:
+        extra += ["--telemetry-log", os.path.join(cache_dir(), "telemetry.jsonl")]
+    if not args.metrics_file:
+        extra += ["--metrics-file", os.path.join(cache_dir(), "metrics.prom")]
+    return extra
+
+
+# Subcommands dispatched before the push-to-talk argument parser
+COMMANDS = {
+    "serve": serve_main,
+    "transcribe": transcribe_main,
+    "batch": batch_main,
+}
+
+
 def main():
     import argparse
     
@@ -390,45 +3204,85 @@ def main():
     except Exception:
         pass  # Ignore stat errors
     
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description=f"HoldScribe v{__version__} - Push-to-talk voice transcription",
-        epilog="Hold your trigger key, speak, release to transcribe and paste!"
+        epilog="Hold your trigger key, speak, release to transcribe and paste! "
+               "Other commands: holdscribe serve, holdscribe transcribe FILE, holdscribe batch PATH"
     )
     parser.add_argument("--version", action="version", version=f"HoldScribe {__version__}")
     parser.add_argument("--key", default="alt_r", 
                        help="Trigger key (default: alt_r, options: f1-f12, space, ctrl_r)")
-    parser.add_argument("--model", default="base",
-                       choices=["tiny", "base", "small", "medium", "large"],
-                       help="AI model size (default: base)")
-    parser.add_argument("--language", default="en",
-                       help="Language code for transcription (default: en)")
-    parser.add_argument("--accent", choices=["indian", "american", "british", "australian"],
-                       help="Accent optimization (default: indian, adds contextual prompting)")
-    parser.add_argument("--initial-prompt", type=str,
-                       help="Custom initial prompt to guide transcription style/context")
+    _add_model_arguments(parser)
+    _add_language_arguments(parser)
+    _add_inference_arguments(parser)
     parser.add_argument("--background", action="store_true",
                        help="Run in background mode (fork process)")
     parser.add_argument("--prompt-permissions", action="store_true",
                        help="Prompt for permissions before each recording (enhanced security)")
     parser.add_argument("--daemon", action="store_true",
                        help="True daemon mode (completely detach from terminal)")
+    parser.add_argument("--stream", action="store_true",
+                       help="Transcribe while the key is held so only the final tail is decoded on release")
+    parser.add_argument("--stream-interval", type=float, default=2.0,
+                       help="Seconds of new audio between rolling decodes in --stream mode (default: 2.0)")
+    parser.add_argument("--source", default="mic", metavar="SPEC",
+                       help="Audio input: mic[:RATE] (captured at the device's native rate unless RATE is "
+                            "given, resampled to 16 kHz in-process), wav:PATH, stdin (raw 16 kHz mono s16le) "
+                            "or synthetic[:SECONDS] (default: mic)")
+    parser.add_argument("--script", metavar="WAIT:HOLD,...",
+                       help="Press and release the trigger on this schedule instead of listening to the "
+                            "keyboard (or @FILE with one WAIT:HOLD per line); exits when done")
+    parser.add_argument("--stdin-stream", action="store_true",
+                       help="Read raw 16 kHz mono s16le PCM from stdin continuously, split it on silence "
+                            "and print one timestamped transcript line per utterance")
+    parser.add_argument("--always-on", action="store_true",
+                       help="Keep the microphone stream open between recordings so capture starts "
+                            "instantly and includes audio from just before the key press")
+    parser.add_argument("--preroll", type=float, default=0.5, metavar="SECONDS",
+                       help="Audio kept from before the key press with --always-on (default: 0.5)")
+    parser.add_argument("--unload-after", type=float, metavar="MINUTES",
+                       help="Release the model after this many idle minutes; it is memory-mapped back "
+                            "from a local cache on the next key press (default: keep it loaded)")
+    parser.add_argument("--no-incremental-mel", action="store_true",
+                       help="Compute log-mel features after release instead of while recording")
+    parser.add_argument("--spill-after", type=float, default=300, metavar="SECONDS",
+                       help="Keep at most this much audio in memory; longer recordings spill to a temporary "
+                            "file and are transcribed in 30s windows (default: 300, 0 = never)")
+    parser.add_argument("--no-vad", action="store_true",
+                       help="Send the whole recording to the model without trimming silence")
+    parser.add_argument("--vad-threshold", type=float, default=-45.0,
+                       help="Level in dBFS a frame must exceed to count as speech (default: -45)")
+    parser.add_argument("--injector", default="auto", choices=["auto", "keyboard", "subprocess", "stub"],
+                       help="How text is typed: in-process keyboard controller, osascript/xdotool, "
+                            "or a stub that only records (default: auto)")
+    parser.add_argument("--paste-threshold", type=int, default=200, metavar="CHARS",
+                       help="Paste text this long via the clipboard instead of typing it (default: 200)")
+    parser.add_argument("--type-segments", action="store_true",
+                       help="In --stream mode, type each stable segment as soon as it is transcribed")
+    parser.add_argument("--telemetry-log", metavar="PATH",
+                       help="Append per-utterance metrics as JSON lines (default in --background/--daemon: "
+                            "~/.cache/holdscribe/telemetry.jsonl)")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                       help="Keep cumulative counters/histograms in this file (Prometheus text format)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                       help="Serve cumulative metrics on http://127.0.0.1:PORT/")
+    parser.add_argument("--server", nargs="?", const=True, metavar="SOCKET",
+                       help="Use the model of a running `holdscribe serve` instead of loading one "
+                            f"(default socket: {DEFAULT_SOCKET_HELP})")
     
     args = parser.parse_args()
     
-    # Set up accent-specific initial prompts
-    accent_prompts = {
-        "indian": "The following is a transcription of Indian English speech. Common Indian English patterns and pronunciation should be expected.",
-        "american": "The following is a transcription of American English speech with standard American pronunciation.",
-        "british": "The following is a transcription of British English speech with standard British pronunciation.",
-        "australian": "The following is a transcription of Australian English speech with standard Australian pronunciation."
-    }
+    initial_prompt = _resolve_initial_prompt(args)
     
-    # Determine the initial prompt - default to Indian accent if none specified
-    initial_prompt = args.initial_prompt
-    if not initial_prompt:
-        # Default to Indian accent if no accent specified and no custom prompt
-        accent_to_use = args.accent if args.accent else "indian"
-        initial_prompt = accent_prompts.get(accent_to_use)
+    # Transcripts own stdout in --stdin-stream mode; status messages go to stderr
+    transcript_output = sys.stdout
+    if args.stdin_stream:
+        sys.stdout = sys.stderr
+        args.source = "stdin"
     
     # For background mode, spawn a new detached process and exit parent
     if args.background:
@@ -446,6 +3300,7 @@ def main():
         for arg in sys.argv[1:]:
             if arg != '--background':
                 cmd_args.append(arg)
+        cmd_args += _detached_telemetry_args(args)
         
         # Start detached background process
         process = subprocess.Popen(
@@ -470,6 +3325,7 @@ def main():
         for arg in sys.argv[1:]:
             if arg != '--daemon':
                 cmd_args.append(arg)
+        cmd_args += _detached_telemetry_args(args)
         process = subprocess.Popen(
             cmd_args,
             start_new_session=True,
@@ -481,7 +3337,9 @@ def main():
         sys.exit(0)
     
     # Now check permissions (after fork for background mode)
-    if args.daemon or args.background:
+    if args.stdin_stream:
+        pass  # Nothing is typed and no keys are monitored
+    elif args.daemon or args.background:
         # Check permissions for background/daemon modes (non-interactive)
         if not check_accessibility_permissions(interactive=False):
             # In background/daemon mode, exit silently if no permissions
@@ -503,33 +3361,48 @@ def main():
             
             print("\n⚠️  Running with limited permissions - some features may not work correctly.")
     
-    # Map key string to Key object
-    key_map = {
-        # Function keys
-        "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
-        "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
-        "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
-        
-        # Modifier keys
-        "space": Key.space,
-        "alt": Key.alt, "alt_r": Key.alt_r, "right_alt": Key.alt_r,
-        "ctrl": Key.ctrl, "ctrl_r": Key.ctrl_r, "right_ctrl": Key.ctrl_r,
-        "cmd": Key.cmd, "cmd_r": Key.cmd_r, "right_cmd": Key.cmd_r,
-        "shift": Key.shift, "shift_r": Key.shift_r, "right_shift": Key.shift_r,
-        
-        # Other useful keys
-        "caps_lock": Key.caps_lock,
-        "tab": Key.tab,
-        "home": Key.home,
-        "end": Key.end,
-        "page_up": Key.page_up,
-        "page_down": Key.page_down,
-        
-        # Arrow keys
-        "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right
-    }
+    # Scripted runs never listen to the keyboard, so pynput is not needed
+    try:
+        script = ScriptedTrigger.parse(args.script) if args.script else None
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if script is not None or args.stdin_stream:
+        trigger_key = args.key  # Only shown in messages
+    else:
+        # Map key string to Key object
+        from pynput.keyboard import Key
+        key_map = {
+            # Function keys
+            "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
+            "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
+            "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
+        
+            # Modifier keys
+            "space": Key.space,
+            "alt": Key.alt, "alt_r": Key.alt_r, "right_alt": Key.alt_r,
+            "ctrl": Key.ctrl, "ctrl_r": Key.ctrl_r, "right_ctrl": Key.ctrl_r,
+            "cmd": Key.cmd, "cmd_r": Key.cmd_r, "right_cmd": Key.cmd_r,
+            "shift": Key.shift, "shift_r": Key.shift_r, "right_shift": Key.shift_r,
+        
+            # Other useful keys
+            "caps_lock": Key.caps_lock,
+            "tab": Key.tab,
+            "home": Key.home,
+            "end": Key.end,
+            "page_up": Key.page_up,
+            "page_down": Key.page_down,
+        
+            # Arrow keys
+            "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right
+        }
     
-    trigger_key = key_map.get(args.key.lower(), Key.alt_r)
+        trigger_key = key_map.get(args.key.lower(), Key.alt_r)
+    
+    telemetry = None
+    if args.telemetry_log or args.metrics_file or args.metrics_port:
+        telemetry = Telemetry(args.telemetry_log, args.metrics_file, args.metrics_port)
     
     holdscribe = HoldScribe(
         trigger_key=trigger_key, 
@@ -537,11 +3410,36 @@ def main():
         background_mode=args.background or args.daemon,
         prompt_permissions=args.prompt_permissions,
         language=args.language,
-        initial_prompt=initial_prompt
+        initial_prompt=initial_prompt,
+        streaming=args.stream,
+        stream_interval=args.stream_interval,
+        server=default_socket_path() if args.server is True else args.server,
+        vad=not args.no_vad,
+        vad_threshold=args.vad_threshold,
+        telemetry=telemetry,
+        model_pool=_model_pool_from_args(args),
+        injector="stub" if args.stdin_stream else args.injector,
+        paste_threshold=args.paste_threshold,
+        type_segments=args.type_segments,
+        threads=args.threads,
+        interop_threads=args.interop_threads,
+        cpu_affinity=args.cpu_affinity,
+        warmup=not args.no_warmup,
+        quantize=args.quantize,
+        backend=args.backend,
+        spill_after=args.spill_after,
+        always_on=args.always_on,
+        preroll=args.preroll,
+        source=args.source,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        unload_after=args.unload_after * 60 if args.unload_after else None,
+        incremental_mel=not args.no_incremental_mel,
+        profile=args.profile
     )
     
     # Show tip only in interactive mode
-    if not args.background and not args.daemon:
+    if not args.background and not args.daemon and not args.stdin_stream and script is None:
         print(f"\n💡 \033[1m\033[36mTIP:\033[0m To run in background: \033[33mholdscribe --background\033[0m")
         print(f"   This lets you use other apps while HoldScribe runs.")
         print(f"   Stop with: \033[31mkillall Python\033[0m or \033[31mpkill -f holdscribe\033[0m")
@@ -555,7 +3453,12 @@ def main():
         print()
     
     try:
-        holdscribe.start_listener()
+        if args.stdin_stream:
+            holdscribe.stream_continuous(transcript_output)
+        elif script is not None:
+            holdscribe.run_script(ScriptedTrigger(script))
+        else:
+            holdscribe.start_listener()
     except KeyboardInterrupt:
         if not args.background and not args.daemon:
             print("\nInterrupted by user")
@@ -33,6 +33,7 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "openai-whisper>=20240930",
+        "numpy>=1.21",
         "pyaudio>=0.2.11",
         "pynput>=1.7.6",
         "pyperclip>=1.8.2",